@@ -1,3 +1,4 @@
+import threading
 import pandas as pd
 import numpy as np
 from sqlalchemy import text
@@ -9,6 +10,7 @@ TABLE_NAME = 'transactions'
 HIGH_VALUE_THRESHOLD = 5000.00
 SUSPICIOUS_MERCHANT = 'Gambling'
 STANDARD_LOCATION = 'Helsinki'
+FEATURE_COLUMNS = ['amount', 'account_avg_amount', 'deviation_from_avg']
 
 def get_account_aggregates(account_id: str, conn):
     """Fetches historical aggregates for a given account."""
@@ -21,25 +23,51 @@ def get_account_aggregates(account_id: str, conn):
         return {"account_tx_count": result.account_tx_count, "account_avg_amount": float(result.account_avg_amount)}
     return {"account_tx_count": 0, "account_avg_amount": 0.0}
 
+# Per-thread 1 x len(FEATURE_COLUMNS) float32 row, reused by every scoring call on that thread
+_feature_rows = threading.local()
+
+def _build_features(transaction: dict, aggregates: dict) -> np.ndarray:
+    """
+    Fills this thread's reusable float32 feature row for a transaction and returns it.
+    The row is overwritten by the next call on the same thread.
+    """
+    features = getattr(_feature_rows, 'row', None)
+    if features is None:
+        features = _feature_rows.row = np.empty((1, len(FEATURE_COLUMNS)), dtype=np.float32)
+
+    tx_amount = np.float32(transaction['amount'])
+    account_avg = np.float32(aggregates['account_avg_amount'])
+    deviation = (tx_amount - account_avg) / (account_avg + np.float32(1e-6)) if account_avg > 0 else np.float32(0)
+    features[0] = (tx_amount, account_avg, deviation)
+    return features
+
+def score_transaction_raw(features: np.ndarray, model, min_score: float, max_score: float) -> float:
+    """
+    Scores a prepared 1 x len(FEATURE_COLUMNS) feature row and scales it to 0-1 (1 = most anomalous).
+    """
+    # Models fit on a named DataFrame validate feature names, so only they get a frame;
+    # models fit on plain arrays score the row directly
+    if hasattr(model, 'feature_names_in_'):
+        features = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+    raw_score = model.decision_function(features)[0]
+    return 1 - (raw_score - min_score) / (max_score - min_score)
+
 def score_transaction(transaction: dict, aggregates: dict, model, min_score: float, max_score: float):
     """
     Scores a single transaction using a pre-loaded model and score boundaries.
     """
-    if not model or min_score is None or max_score is None:
+    # Validate before any feature work; `is None` avoids the ensemble's __len__ that `not model` calls
+    if model is None or min_score is None or max_score is None:
         raise RuntimeError("Model or score boundaries are not provided.")
 
     # 1. Engineer features for the single transaction
-    tx_amount = transaction['amount']
-    account_avg = aggregates['account_avg_amount']
-    deviation = (tx_amount - account_avg) / (account_avg + 1e-6) if account_avg > 0 else 0
-    
-    # Create a DataFrame for the single transaction's features
-    tx_features = pd.DataFrame([[tx_amount, account_avg, deviation]], 
-                               columns=['amount', 'account_avg_amount', 'deviation_from_avg'])
+    # The feature row is float32: the Isolation Forest trees split on float32
+    # internally, so float64 input would be copied on every decision_function call
+    features = _build_features(transaction, aggregates)
+    tx_amount, _, deviation = features[0]
 
     # 2. Score with the model and scale the score
-    raw_score = model.decision_function(tx_features)[0]
-    scaled_score = 1 - (raw_score - min_score) / (max_score - min_score)
+    scaled_score = score_transaction_raw(features, model, min_score, max_score)
     
     # 3. Apply rules to generate an alert reason
     reasons = []
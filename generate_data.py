@@ -75,8 +75,11 @@ def generate_synthetic_data(n_transactions):
     df.loc[small_fraud_indices, 'merchant_category'] = 'Gambling'
     df.loc[small_fraud_indices, 'is_fraud'] = 1
     
-    # Ensure the timestamp is in a clean format for SQL
-    df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    # Store amounts as float32 to match the dtype the model is trained and scored on
+    df['amount'] = df['amount'].astype(np.float32)
+
+    # Emit ISO-8601 timestamps so consumers can parse them with datetime.fromisoformat
+    df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
 
     return df
 
@@ -16,20 +16,38 @@ Usage:
 
     notifier = NotificationService()
     notifier.send_fraud_alert(transaction_data, anomaly_score=0.95)
+
+    # From async code (single event loop, HTTP/2 keep-alive client)
+    from notification_service import AsyncNotificationService
+
+    notifier = AsyncNotificationService()
+    await notifier.send_fraud_alert(transaction_data, anomaly_score=0.95)
 """
 
 import os
+import re
+import asyncio
+import atexit
 import logging
 import json
 import smtplib
+import threading
+from collections import defaultdict
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
+import aiohttp
+import aiosmtplib
+import httpx
+import orjson
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
 # Configuration
 SLACK_WEBHOOK_URL = os.environ.get("SLACK_WEBHOOK_URL", "")
@@ -44,6 +62,10 @@ SMTP_USERNAME = os.environ.get("SMTP_USERNAME", "")
 SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
 EMAIL_FROM = os.environ.get("EMAIL_FROM", "fraud-alerts@company.com")
 EMAIL_TO = os.environ.get("EMAIL_TO", "security-team@company.com").split(",")
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.environ.get("SMTP_MAX_MESSAGES_PER_CONNECTION", 100))
+
+# Burst coalescing: Slack/Discord alerts arriving within this window share one webhook post (0 disables)
+ALERT_COALESCE_WINDOW_MS = int(os.environ.get("ALERT_COALESCE_WINDOW_MS", 200))
 
 # Alert thresholds
 HIGH_RISK_THRESHOLD = float(os.environ.get("HIGH_RISK_THRESHOLD", 0.8))
@@ -63,6 +85,123 @@ class AlertSeverity(Enum):
     CRITICAL = "critical"
 
 
+# Per-severity presentation lookups shared by all message formatters
+_SLACK_COLOR = {
+    AlertSeverity.CRITICAL: "#FF0000",  # Red
+    AlertSeverity.HIGH: "#FF6600",      # Orange
+    AlertSeverity.WARNING: "#FFCC00",   # Yellow
+    AlertSeverity.INFO: "#0099FF"       # Blue
+}
+
+_DISCORD_COLOR = {
+    AlertSeverity.CRITICAL: 16711680,  # Red
+    AlertSeverity.HIGH: 16737792,      # Orange
+    AlertSeverity.WARNING: 16776960,   # Yellow
+    AlertSeverity.INFO: 43775          # Blue
+}
+
+_TEAMS_COLOR = {
+    AlertSeverity.CRITICAL: "attention",
+    AlertSeverity.HIGH: "warning",
+    AlertSeverity.WARNING: "warning",
+    AlertSeverity.INFO: "accent"
+}
+
+_SEVERITY_EMOJI = {
+    AlertSeverity.CRITICAL: "🚨",
+    AlertSeverity.HIGH: "⚠️",
+    AlertSeverity.WARNING: "⚡",
+    AlertSeverity.INFO: "ℹ️"
+}
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Fields shown in chat messages: (Slack title, Discord/Teams name, value key, Slack "short" flag).
+# Values are computed once per alert by _alert_values(); labels are fixed.
+_ALERT_FIELDS = (
+    ("Transaction ID", "Transaction ID", 'transaction_id', True),
+    ("Anomaly Score", "Anomaly Score", 'anomaly_score', True),
+    ("Amount", "Amount", 'amount', True),
+    ("Account ID", "Account ID", 'account_id', True),
+    ("Merchant Category", "Category", 'merchant_category', True),
+    ("Location", "Location", 'location', True),
+    ("Timestamp", None, 'timestamp', False),
+    ("Alert Reason", "Alert Reason", 'alert_reason', False),
+)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes with orjson (numpy scalars supported, unknown types as str)."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+# Template slots: placeholder strings that are split out of the pre-encoded JSON
+_SLOT_RE = re.compile(rb'"__SLOT_(\w+?)__"')
+
+
+def _slot(key: str) -> str:
+    return f"__SLOT_{key}__"
+
+
+def _compile_template(message: Dict) -> Tuple[Tuple[bytes, ...], Tuple[str, ...]]:
+    """Encode a message containing _slot() placeholders into constant byte chunks and slot keys."""
+    parts = _SLOT_RE.split(_dumps(message))
+    return tuple(parts[0::2]), tuple(key.decode() for key in parts[1::2])
+
+
+def _render(template: Tuple[Tuple[bytes, ...], Tuple[str, ...]], values: Dict) -> bytes:
+    """Splice JSON-encoded values into a compiled template."""
+    chunks, keys = template
+    out = [chunks[0]]
+    for key, chunk in zip(keys, chunks[1:]):
+        out.append(_dumps(values[key]))
+        out.append(chunk)
+    return b''.join(out)
+
+
+def _encode(message) -> bytes:
+    """Return the JSON body for a message that may already be encoded."""
+    return message if isinstance(message, bytes) else _dumps(message)
+
+
+async def _post_with_retry(channel_name: str, post) -> bool:
+    """
+    Await post() with retries and exponential backoff.
+
+    Shared by the aiohttp and httpx async paths; post is a zero-argument coroutine
+    function that sends the request and raises on an HTTP error status.
+    """
+    try:
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=1, min=2, max=10),
+            reraise=True
+        ):
+            with attempt:
+                await post()
+        logger.info(f"{channel_name} notification sent successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to send {channel_name} notification: {e}")
+        raise
+
+
+def _alert_values(transaction: Dict, anomaly_score: float) -> Dict[str, str]:
+    """Compute the display values shared by every chat message for one alert."""
+    return {
+        'transaction_id': transaction.get('transaction_id', 'N/A'),
+        'anomaly_score': f"{anomaly_score:.2%}",
+        'amount': f"€{transaction.get('amount', 0):.2f}",
+        'account_id': transaction.get('account_id', 'N/A'),
+        'merchant_category': transaction.get('merchant_category', 'N/A'),
+        'location': transaction.get('location', 'N/A'),
+        'timestamp': transaction.get('timestamp', 'N/A'),
+        'alert_reason': transaction.get('alert_reason', 'N/A'),
+    }
+
+
 class NotificationChannel(Enum):
     """Available notification channels."""
     SLACK = "slack"
@@ -72,14 +211,85 @@ class NotificationChannel(Enum):
     WEBHOOK = "webhook"
 
 
+# Maximum alerts per coalesced post: Slack attachments / Discord embeds per message
+_COALESCE_LIMITS = {
+    NotificationChannel.SLACK: 20,
+    NotificationChannel.DISCORD: 10,
+}
+
+
 class NotificationService:
     """Service for sending fraud alert notifications."""
 
     def __init__(self):
         """Initialize notification service."""
-        self.enabled_channels = self._detect_enabled_channels()
+        self.enabled_channels = frozenset(self._detect_enabled_channels())
+        self._session = self._create_session()
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="notif")
+        self._smtp = None
+        self._smtp_sent = 0
+        self._smtp_lock = threading.Lock()
+        self._aio_session = None  # aiohttp session, created on first use inside an event loop
+        self._pending = defaultdict(list)
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+
+        self._build_templates()
+
+        # Channel -> (formatter, sender); subclasses pick up overridden senders automatically
+        self._dispatchers = {
+            NotificationChannel.SLACK: (self._format_slack_message, self._send_slack_notification),
+            NotificationChannel.DISCORD: (self._format_discord_message, self._send_discord_notification),
+            NotificationChannel.TEAMS: (self._format_teams_message, self._send_teams_notification),
+            NotificationChannel.EMAIL: (self._format_email_message, self._send_email_message),
+            NotificationChannel.WEBHOOK: (self._format_webhook_payload, self._send_custom_webhook),
+        }
+        self._element_formatters = {
+            NotificationChannel.SLACK: self._format_slack_attachment,
+            NotificationChannel.DISCORD: self._format_discord_embed,
+        }
+        atexit.register(self.close)
         logger.info(f"Notification service initialized. Enabled channels: {[c.value for c in self.enabled_channels]}")
 
+    def _build_templates(self) -> None:
+        """Pre-encode the constant JSON of each chat message once per severity."""
+        slack_fields = [
+            {"title": title, "value": _slot(key), "short": short} for title, _, key, short in _ALERT_FIELDS
+        ]
+        discord_fields = [
+            {"name": name, "value": _slot(key), "inline": short} for _, name, key, short in _ALERT_FIELDS if name
+        ]
+        teams_facts = [{"name": name, "value": _slot(key)} for _, name, key, _ in _ALERT_FIELDS if name]
+
+        self._slack_heads = {}
+        self._templates = {}
+        for severity in AlertSeverity:
+            title = f"Fraud Alert - {severity.value.upper()}"
+            self._slack_heads[severity] = (
+                b'{"text":' + _dumps(f"{_SEVERITY_EMOJI[severity]} *{title}*") + b',"attachments":['
+            )
+            self._templates[NotificationChannel.SLACK, severity] = _compile_template({
+                "color": _SLACK_COLOR[severity],
+                "fields": slack_fields,
+                "footer": "Fraud Detection System",
+                "ts": _slot('now_ts')
+            })
+            self._templates[NotificationChannel.DISCORD, severity] = _compile_template({
+                "title": f"🚨 {title}",
+                "color": _DISCORD_COLOR[severity],
+                "fields": discord_fields,
+                "timestamp": _slot('now_iso'),
+                "footer": {"text": "Fraud Detection System"}
+            })
+            self._templates[NotificationChannel.TEAMS, severity] = _compile_template({
+                "@type": "MessageCard",
+                "@context": "https://schema.org/extensions",
+                "summary": title,
+                "themeColor": _TEAMS_COLOR[severity],
+                "title": f"🚨 {title}",
+                "sections": [{"facts": teams_facts}]
+            })
+
     def _detect_enabled_channels(self) -> List[NotificationChannel]:
         """Detect which notification channels are configured."""
         channels = []
@@ -101,6 +311,70 @@ class NotificationService:
 
         return channels
 
+    def _create_session(self) -> requests.Session:
+        """
+        Create a shared HTTP session so webhook connections are kept alive across alerts.
+
+        Retries happen in the adapter: connection errors and 429/5xx responses are retried
+        with exponential backoff, honouring Retry-After from Slack/Discord rate limits.
+        """
+        session = requests.Session()
+        retries = Retry(
+            total=3,
+            backoff_factor=2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['POST'],
+            respect_retry_after_header=True,
+            raise_on_status=False  # Hand the final response to raise_for_status()
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retries)
+        for url in (SLACK_WEBHOOK_URL, DISCORD_WEBHOOK_URL, TEAMS_WEBHOOK_URL, CUSTOM_WEBHOOK_URL):
+            if url:
+                session.mount(url, adapter)
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections and worker threads."""
+        self._flush_pending()
+        self._pool.shutdown(wait=True)
+        self._session.close()
+        with self._smtp_lock:
+            self._close_smtp()
+
+    def _close_smtp(self) -> None:
+        """Close the cached SMTP connection, if any (caller holds _smtp_lock)."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+            self._smtp_sent = 0
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """
+        Return a logged-in SMTP connection, reusing the cached one while it is healthy
+        (caller holds _smtp_lock). The connection is rotated every
+        SMTP_MAX_MESSAGES_PER_CONNECTION messages to respect provider limits.
+        """
+        if self._smtp is not None:
+            if self._smtp_sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+                self._close_smtp()
+            else:
+                try:
+                    if self._smtp.noop()[0] == 250:
+                        return self._smtp
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._close_smtp()
+
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+        server.starttls()
+        server.login(SMTP_USERNAME, SMTP_PASSWORD)
+        self._smtp = server
+        self._smtp_sent = 0
+        return server
+
     def determine_severity(self, anomaly_score: float, amount: float) -> AlertSeverity:
         """
         Determine alert severity based on risk score and transaction amount.
@@ -121,13 +395,13 @@ class NotificationService:
         else:
             return AlertSeverity.INFO
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def _send_slack_notification(self, message: Dict) -> bool:
+    def _send_slack_notification(self, message: bytes) -> bool:
         """Send notification to Slack."""
         try:
-            response = requests.post(
+            response = self._session.post(
                 SLACK_WEBHOOK_URL,
-                json=message,
+                data=message,
+                headers=_JSON_HEADERS,
                 timeout=10
             )
             response.raise_for_status()
@@ -138,13 +412,13 @@ class NotificationService:
             logger.error(f"Failed to send Slack notification: {e}")
             raise
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def _send_discord_notification(self, message: Dict) -> bool:
+    def _send_discord_notification(self, message: bytes) -> bool:
         """Send notification to Discord."""
         try:
-            response = requests.post(
+            response = self._session.post(
                 DISCORD_WEBHOOK_URL,
-                json=message,
+                data=message,
+                headers=_JSON_HEADERS,
                 timeout=10
             )
             response.raise_for_status()
@@ -155,13 +429,13 @@ class NotificationService:
             logger.error(f"Failed to send Discord notification: {e}")
             raise
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def _send_teams_notification(self, message: Dict) -> bool:
+    def _send_teams_notification(self, message: bytes) -> bool:
         """Send notification to Microsoft Teams."""
         try:
-            response = requests.post(
+            response = self._session.post(
                 TEAMS_WEBHOOK_URL,
-                json=message,
+                data=message,
+                headers=_JSON_HEADERS,
                 timeout=10
             )
             response.raise_for_status()
@@ -172,14 +446,13 @@ class NotificationService:
             logger.error(f"Failed to send Teams notification: {e}")
             raise
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _send_custom_webhook(self, payload: Dict) -> bool:
         """Send notification to custom webhook endpoint."""
         try:
-            response = requests.post(
+            response = self._session.post(
                 CUSTOM_WEBHOOK_URL,
-                json=payload,
-                headers={"Content-Type": "application/json"},
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=10
             )
             response.raise_for_status()
@@ -190,28 +463,43 @@ class NotificationService:
             logger.error(f"Failed to send custom webhook notification: {e}")
             raise
 
+    def _send_email_message(self, message: Tuple[str, str]) -> bool:
+        """Send a (subject, body) pair produced by _format_email_message."""
+        return self._send_email_notification(*message)
+
+    @staticmethod
+    def _build_email(subject: str, body: str) -> MIMEMultipart:
+        """Build the plain-text + HTML alert email."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = EMAIL_FROM
+        msg['To'] = ', '.join(EMAIL_TO)
+
+        # Plain text version
+        text_part = MIMEText(body, 'plain')
+        msg.attach(text_part)
+
+        # HTML version
+        html_body = body.replace('\n', '<br>')
+        html_part = MIMEText(f'<html><body>{html_body}</body></html>', 'html')
+        msg.attach(html_part)
+        return msg
+
     def _send_email_notification(self, subject: str, body: str) -> bool:
         """Send email notification."""
         try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = EMAIL_FROM
-            msg['To'] = ', '.join(EMAIL_TO)
-
-            # Plain text version
-            text_part = MIMEText(body, 'plain')
-            msg.attach(text_part)
-
-            # HTML version
-            html_body = body.replace('\n', '<br>')
-            html_part = MIMEText(f'<html><body>{html_body}</body></html>', 'html')
-            msg.attach(html_part)
-
-            # Send email
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                server.starttls()
-                server.login(SMTP_USERNAME, SMTP_PASSWORD)
-                server.send_message(msg)
+            msg = self._build_email(subject, body)
+
+            # Send email over the cached connection (STARTTLS + AUTH only on reconnect)
+            with self._smtp_lock:
+                try:
+                    self._get_smtp().send_message(msg)
+                    self._smtp_sent += 1
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    # Connection dropped between health check and send; retry once on a fresh one
+                    self._close_smtp()
+                    self._get_smtp().send_message(msg)
+                    self._smtp_sent += 1
 
             logger.info(f"Email notification sent to {EMAIL_TO}")
             return True
@@ -220,150 +508,175 @@ class NotificationService:
             logger.error(f"Failed to send email notification: {e}")
             return False
 
+    def _format_slack_attachment(
+        self,
+        transaction: Dict,
+        severity: AlertSeverity,
+        anomaly_score: float,
+        now: datetime
+    ) -> bytes:
+        """Encode one alert as a Slack attachment."""
+        values = _alert_values(transaction, anomaly_score)
+        values['now_ts'] = int(now.timestamp())
+        return _render(self._templates[NotificationChannel.SLACK, severity], values)
+
+    def _wrap_slack(self, attachments: List[bytes], severity: Optional[AlertSeverity] = None) -> bytes:
+        """Build a Slack message body around encoded attachments (severity=None for a burst)."""
+        if severity is not None:
+            head = self._slack_heads[severity]
+        else:
+            head = b'{"text":' + _dumps(f"🚨 *{len(attachments)} Fraud Alerts*") + b',"attachments":['
+        return head + b','.join(attachments) + b']}'
+
     def _format_slack_message(
         self,
         transaction: Dict,
         severity: AlertSeverity,
-        anomaly_score: float
-    ) -> Dict:
+        anomaly_score: float,
+        now: datetime
+    ) -> bytes:
         """Format message for Slack."""
-        # Color coding by severity
-        color_map = {
-            AlertSeverity.CRITICAL: "#FF0000",  # Red
-            AlertSeverity.HIGH: "#FF6600",      # Orange
-            AlertSeverity.WARNING: "#FFCC00",   # Yellow
-            AlertSeverity.INFO: "#0099FF"       # Blue
-        }
-
-        emoji_map = {
-            AlertSeverity.CRITICAL: "🚨",
-            AlertSeverity.HIGH: "⚠️",
-            AlertSeverity.WARNING: "⚡",
-            AlertSeverity.INFO: "ℹ️"
-        }
+        return self._wrap_slack([self._format_slack_attachment(transaction, severity, anomaly_score, now)], severity)
 
-        return {
-            "text": f"{emoji_map[severity]} *Fraud Alert - {severity.value.upper()}*",
-            "attachments": [
-                {
-                    "color": color_map[severity],
-                    "fields": [
-                        {
-                            "title": "Transaction ID",
-                            "value": transaction.get('transaction_id', 'N/A'),
-                            "short": True
-                        },
-                        {
-                            "title": "Anomaly Score",
-                            "value": f"{anomaly_score:.2%}",
-                            "short": True
-                        },
-                        {
-                            "title": "Amount",
-                            "value": f"€{transaction.get('amount', 0):.2f}",
-                            "short": True
-                        },
-                        {
-                            "title": "Account ID",
-                            "value": transaction.get('account_id', 'N/A'),
-                            "short": True
-                        },
-                        {
-                            "title": "Merchant Category",
-                            "value": transaction.get('merchant_category', 'N/A'),
-                            "short": True
-                        },
-                        {
-                            "title": "Location",
-                            "value": transaction.get('location', 'N/A'),
-                            "short": True
-                        },
-                        {
-                            "title": "Timestamp",
-                            "value": transaction.get('timestamp', 'N/A'),
-                            "short": False
-                        },
-                        {
-                            "title": "Alert Reason",
-                            "value": transaction.get('alert_reason', 'N/A'),
-                            "short": False
-                        }
-                    ],
-                    "footer": "Fraud Detection System",
-                    "ts": int(datetime.now().timestamp())
-                }
-            ]
-        }
+    def _format_discord_embed(
+        self,
+        transaction: Dict,
+        severity: AlertSeverity,
+        anomaly_score: float,
+        now: datetime
+    ) -> bytes:
+        """Encode one alert as a Discord embed."""
+        values = _alert_values(transaction, anomaly_score)
+        values['now_iso'] = now.isoformat()
+        return _render(self._templates[NotificationChannel.DISCORD, severity], values)
+
+    @staticmethod
+    def _wrap_discord(embeds: List[bytes]) -> bytes:
+        """Build a Discord message body around encoded embeds."""
+        return b'{"embeds":[' + b','.join(embeds) + b']}'
 
     def _format_discord_message(
         self,
         transaction: Dict,
         severity: AlertSeverity,
-        anomaly_score: float
-    ) -> Dict:
+        anomaly_score: float,
+        now: datetime
+    ) -> bytes:
         """Format message for Discord."""
-        color_map = {
-            AlertSeverity.CRITICAL: 16711680,  # Red
-            AlertSeverity.HIGH: 16737792,      # Orange
-            AlertSeverity.WARNING: 16776960,   # Yellow
-            AlertSeverity.INFO: 43775          # Blue
-        }
-
-        return {
-            "embeds": [
-                {
-                    "title": f"🚨 Fraud Alert - {severity.value.upper()}",
-                    "color": color_map[severity],
-                    "fields": [
-                        {"name": "Transaction ID", "value": transaction.get('transaction_id', 'N/A'), "inline": True},
-                        {"name": "Anomaly Score", "value": f"{anomaly_score:.2%}", "inline": True},
-                        {"name": "Amount", "value": f"€{transaction.get('amount', 0):.2f}", "inline": True},
-                        {"name": "Account ID", "value": transaction.get('account_id', 'N/A'), "inline": True},
-                        {"name": "Category", "value": transaction.get('merchant_category', 'N/A'), "inline": True},
-                        {"name": "Location", "value": transaction.get('location', 'N/A'), "inline": True},
-                        {"name": "Alert Reason", "value": transaction.get('alert_reason', 'N/A'), "inline": False}
-                    ],
-                    "timestamp": datetime.now().isoformat(),
-                    "footer": {"text": "Fraud Detection System"}
-                }
-            ]
-        }
+        return self._wrap_discord([self._format_discord_embed(transaction, severity, anomaly_score, now)])
 
     def _format_teams_message(
         self,
         transaction: Dict,
         severity: AlertSeverity,
-        anomaly_score: float
-    ) -> Dict:
+        anomaly_score: float,
+        now: datetime
+    ) -> bytes:
         """Format message for Microsoft Teams."""
-        color_map = {
-            AlertSeverity.CRITICAL: "attention",
-            AlertSeverity.HIGH: "warning",
-            AlertSeverity.WARNING: "warning",
-            AlertSeverity.INFO: "accent"
-        }
+        return _render(
+            self._templates[NotificationChannel.TEAMS, severity],
+            _alert_values(transaction, anomaly_score)
+        )
 
+    def _format_email_message(
+        self,
+        transaction: Dict,
+        severity: AlertSeverity,
+        anomaly_score: float,
+        now: datetime
+    ) -> Tuple[str, str]:
+        """Format email subject and body."""
+        subject = f"🚨 Fraud Alert - {severity.value.upper()}: €{transaction.get('amount', 0):.2f}"
+        body = f"""
+High-risk fraud transaction detected:
+
+Transaction ID: {transaction.get('transaction_id', 'N/A')}
+Anomaly Score: {anomaly_score:.2%}
+Amount: €{transaction.get('amount', 0):.2f}
+Account ID: {transaction.get('account_id', 'N/A')}
+Merchant Category: {transaction.get('merchant_category', 'N/A')}
+Location: {transaction.get('location', 'N/A')}
+Timestamp: {transaction.get('timestamp', 'N/A')}
+Alert Reason: {transaction.get('alert_reason', 'N/A')}
+
+Severity: {severity.value.upper()}
+
+Please investigate immediately.
+        """
+        return subject, body.strip()
+
+    def _format_webhook_payload(
+        self,
+        transaction: Dict,
+        severity: AlertSeverity,
+        anomaly_score: float,
+        now: datetime
+    ) -> Dict:
+        """Format payload for custom webhook."""
         return {
-            "@type": "MessageCard",
-            "@context": "https://schema.org/extensions",
-            "summary": f"Fraud Alert - {severity.value.upper()}",
-            "themeColor": color_map[severity],
-            "title": f"🚨 Fraud Alert - {severity.value.upper()}",
-            "sections": [
-                {
-                    "facts": [
-                        {"name": "Transaction ID", "value": transaction.get('transaction_id', 'N/A')},
-                        {"name": "Anomaly Score", "value": f"{anomaly_score:.2%}"},
-                        {"name": "Amount", "value": f"€{transaction.get('amount', 0):.2f}"},
-                        {"name": "Account ID", "value": transaction.get('account_id', 'N/A')},
-                        {"name": "Category", "value": transaction.get('merchant_category', 'N/A')},
-                        {"name": "Location", "value": transaction.get('location', 'N/A')},
-                        {"name": "Alert Reason", "value": transaction.get('alert_reason', 'N/A')}
-                    ]
-                }
-            ]
+            "event": "fraud_alert",
+            "severity": severity.value,
+            "transaction": transaction,
+            "anomaly_score": anomaly_score,
+            "timestamp": now.isoformat()
         }
 
+    def _queue_coalesced(self, channel: NotificationChannel, severity: AlertSeverity, element: bytes) -> None:
+        """Buffer a Slack attachment/Discord embed; the burst is posted when the window closes or fills."""
+        with self._pending_lock:
+            pending = self._pending[channel]
+            pending.append((severity, element))
+            full = len(pending) >= _COALESCE_LIMITS[channel]
+            if full:
+                batch = self._pending.pop(channel)
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(ALERT_COALESCE_WINDOW_MS / 1000, self._flush_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+        if full:
+            self._pool.submit(self._send_coalesced, channel, batch)
+
+    def _flush_pending(self) -> None:
+        """Post every buffered burst."""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending = self._pending, defaultdict(list)
+
+        for channel, batch in pending.items():
+            self._send_coalesced(channel, batch)
+
+    def _merge_messages(self, channel: NotificationChannel, batch: List[Tuple[AlertSeverity, bytes]]) -> bytes:
+        """Combine buffered alerts into one Slack/Discord payload."""
+        elements = [element for _, element in batch]
+        if channel == NotificationChannel.SLACK:
+            # A lone alert keeps its severity headline
+            return self._wrap_slack(elements, batch[0][0] if len(batch) == 1 else None)
+        return self._wrap_discord(elements)
+
+    def _send_coalesced(self, channel: NotificationChannel, batch: List[Tuple[AlertSeverity, bytes]]) -> bool:
+        """Send a buffered burst as one post."""
+        _, send = self._dispatchers[channel]
+        try:
+            return send(self._merge_messages(channel, batch))
+        except Exception as e:
+            logger.error(f"Failed to send {len(batch)} coalesced alerts via {channel.value}: {e}")
+            return False
+
+    def _dispatch(
+        self,
+        channel: NotificationChannel,
+        transaction: Dict,
+        severity: AlertSeverity,
+        anomaly_score: float,
+        now: datetime
+    ):
+        """Format and send the alert on one channel."""
+        format_message, send = self._dispatchers[channel]
+        return send(format_message(transaction, severity, anomaly_score, now))
+
     def send_fraud_alert(
         self,
         transaction: Dict,
@@ -372,6 +685,9 @@ class NotificationService:
     ) -> Dict[str, bool]:
         """
         Send fraud alert notification across configured channels.
+        Channels are sent concurrently, so the alert takes as long as the slowest channel.
+        Slack and Discord alerts are buffered for ALERT_COALESCE_WINDOW_MS and posted together,
+        so for those channels True means the alert was queued.
 
         Args:
             transaction: Transaction data dictionary
@@ -390,56 +706,236 @@ class NotificationService:
 
         # Use specified channels or all enabled channels
         target_channels = channels if channels else self.enabled_channels
+        now = datetime.now()  # One clock read shared by every channel's message
 
         results = {}
-
-        for channel in target_channels:
+        futures = {}
+        for channel in self.enabled_channels.intersection(target_channels):
+            if ALERT_COALESCE_WINDOW_MS > 0 and channel in _COALESCE_LIMITS:
+                format_element = self._element_formatters[channel]
+                self._queue_coalesced(channel, severity, format_element(transaction, severity, anomaly_score, now))
+                results[channel.value] = True
+            else:
+                futures[self._pool.submit(self._dispatch, channel, transaction, severity, anomaly_score, now)] = channel
+
+        for future in as_completed(futures):
+            channel = futures[future]
             try:
-                if channel == NotificationChannel.SLACK and channel in self.enabled_channels:
-                    message = self._format_slack_message(transaction, severity, anomaly_score)
-                    results['slack'] = self._send_slack_notification(message)
+                results[channel.value] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to send notification via {channel.value}: {e}")
+                results[channel.value] = False
 
-                elif channel == NotificationChannel.DISCORD and channel in self.enabled_channels:
-                    message = self._format_discord_message(transaction, severity, anomaly_score)
-                    results['discord'] = self._send_discord_notification(message)
+        logger.info(f"Fraud alert sent: {transaction.get('transaction_id')} - Severity: {severity.value} - Channels: {list(results.keys())}")
 
-                elif channel == NotificationChannel.TEAMS and channel in self.enabled_channels:
-                    message = self._format_teams_message(transaction, severity, anomaly_score)
-                    results['teams'] = self._send_teams_notification(message)
+        return results
 
-                elif channel == NotificationChannel.EMAIL and channel in self.enabled_channels:
-                    subject = f"🚨 Fraud Alert - {severity.value.upper()}: €{transaction.get('amount', 0):.2f}"
-                    body = f"""
-High-risk fraud transaction detected:
 
-Transaction ID: {transaction.get('transaction_id', 'N/A')}
-Anomaly Score: {anomaly_score:.2%}
-Amount: €{transaction.get('amount', 0):.2f}
-Account ID: {transaction.get('account_id', 'N/A')}
-Merchant Category: {transaction.get('merchant_category', 'N/A')}
-Location: {transaction.get('location', 'N/A')}
-Timestamp: {transaction.get('timestamp', 'N/A')}
-Alert Reason: {transaction.get('alert_reason', 'N/A')}
+    # --- Native asyncio path (aiohttp / aiosmtplib) ---
+    # This path lets the sync singleton from get_notification_service() serve async callers
+    # (send_fraud_alert_async) without a second service. Its aiohttp session is created
+    # lazily on the caller's loop, since the singleton is usually built outside one.
+    # AsyncNotificationService creates its own HTTP/2 httpx client up front. Both paths
+    # share _post_with_retry, so they apply the same backoff policy.
 
-Severity: {severity.value.upper()}
+    def _get_aio_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on the running event loop."""
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._aio_session
 
-Please investigate immediately.
-                    """
-                    results['email'] = self._send_email_notification(subject, body.strip())
-
-                elif channel == NotificationChannel.WEBHOOK and channel in self.enabled_channels:
-                    payload = {
-                        "event": "fraud_alert",
-                        "severity": severity.value,
-                        "transaction": transaction,
-                        "anomaly_score": anomaly_score,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    results['webhook'] = self._send_custom_webhook(payload)
+    async def aclose(self) -> None:
+        """Close the aiohttp session used by send_fraud_alert_async."""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
 
-            except Exception as e:
-                logger.error(f"Failed to send notification via {channel.value}: {e}")
+    async def _post_aiohttp(self, channel_name: str, url: str, body) -> bool:
+        """POST a JSON body on the shared aiohttp session."""
+        data = _encode(body)
+
+        async def post():
+            async with self._get_aio_session().post(url, data=data, headers=_JSON_HEADERS) as response:
+                response.raise_for_status()
+
+        return await _post_with_retry(channel_name, post)
+
+    async def _send_email_aiosmtplib(self, message: Tuple[str, str]) -> bool:
+        """Send email notification without blocking the event loop."""
+        try:
+            await aiosmtplib.send(
+                self._build_email(*message),
+                hostname=SMTP_SERVER,
+                port=SMTP_PORT,
+                start_tls=True,
+                username=SMTP_USERNAME,
+                password=SMTP_PASSWORD
+            )
+            logger.info(f"Email notification sent to {EMAIL_TO}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to send email notification: {e}")
+            return False
+
+    def _async_senders(self):
+        """Channel -> coroutine function used by send_fraud_alert_async."""
+        return {
+            NotificationChannel.SLACK: lambda body: self._post_aiohttp("Slack", SLACK_WEBHOOK_URL, body),
+            NotificationChannel.DISCORD: lambda body: self._post_aiohttp("Discord", DISCORD_WEBHOOK_URL, body),
+            NotificationChannel.TEAMS: lambda body: self._post_aiohttp("Teams", TEAMS_WEBHOOK_URL, body),
+            NotificationChannel.EMAIL: self._send_email_aiosmtplib,
+            NotificationChannel.WEBHOOK: lambda body: self._post_aiohttp("Custom webhook", CUSTOM_WEBHOOK_URL, body),
+        }
+
+    async def send_fraud_alert_async(
+        self,
+        transaction: Dict,
+        anomaly_score: float,
+        channels: Optional[List[NotificationChannel]] = None
+    ) -> Dict[str, bool]:
+        """
+        Send fraud alert notification from inside an event loop.
+        Webhooks go through a shared aiohttp session and email through aiosmtplib, so the
+        caller's loop keeps running while alerts are in flight. Alerts are not coalesced.
+
+        Args:
+            transaction: Transaction data dictionary
+            anomaly_score: ML anomaly score (0-1)
+            channels: Specific channels to use (None = all enabled)
+
+        Returns:
+            Dictionary mapping channel name to success status
+        """
+        severity = self.determine_severity(anomaly_score, transaction.get('amount', 0))
+
+        # Only send notifications for HIGH and CRITICAL alerts
+        if severity not in [AlertSeverity.HIGH, AlertSeverity.CRITICAL]:
+            logger.debug(f"Alert severity {severity.value} below notification threshold - skipping")
+            return {}
+
+        target_channels = channels if channels else self.enabled_channels
+        now = datetime.now()  # One clock read shared by every channel's message
+
+        senders = self._async_senders()
+        sends = list(self.enabled_channels.intersection(target_channels))
+        outcomes = await asyncio.gather(
+            *(
+                senders[channel](self._dispatchers[channel][0](transaction, severity, anomaly_score, now))
+                for channel in sends
+            ),
+            return_exceptions=True
+        )
+
+        results = {}
+        for channel, outcome in zip(sends, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to send notification via {channel.value}: {outcome}")
                 results[channel.value] = False
+            else:
+                results[channel.value] = outcome
+
+        logger.info(f"Fraud alert sent: {transaction.get('transaction_id')} - Severity: {severity.value} - Channels: {list(results.keys())}")
+
+        return results
+
+
+class AsyncNotificationService(NotificationService):
+    """
+    Asyncio variant of NotificationService.
+
+    Webhooks are posted through a shared httpx.AsyncClient (HTTP/2, keep-alive) and all
+    channels are awaited concurrently on the event loop instead of on worker threads.
+    """
+
+    def __init__(self):
+        """Initialize async notification service."""
+        super().__init__()
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+
+    async def aclose(self) -> None:
+        """Close the async HTTP clients."""
+        await self._client.aclose()
+        await super().aclose()
+
+    async def _post_async(self, channel_name: str, url: str, message) -> bool:
+        """POST a JSON message on the shared httpx client."""
+        content = _encode(message)
+
+        async def post():
+            response = await self._client.post(url, content=content, headers=_JSON_HEADERS)
+            response.raise_for_status()
+
+        return await _post_with_retry(channel_name, post)
+
+    async def _send_slack_notification(self, message: bytes) -> bool:
+        """Send notification to Slack."""
+        return await self._post_async("Slack", SLACK_WEBHOOK_URL, message)
+
+    async def _send_discord_notification(self, message: bytes) -> bool:
+        """Send notification to Discord."""
+        return await self._post_async("Discord", DISCORD_WEBHOOK_URL, message)
+
+    async def _send_teams_notification(self, message: bytes) -> bool:
+        """Send notification to Microsoft Teams."""
+        return await self._post_async("Teams", TEAMS_WEBHOOK_URL, message)
+
+    async def _send_custom_webhook(self, payload: Dict) -> bool:
+        """Send notification to custom webhook endpoint."""
+        return await self._post_async("Custom webhook", CUSTOM_WEBHOOK_URL, payload)
+
+    async def _send_email_message(self, message: Tuple[str, str]) -> bool:
+        """Send email notification without blocking the event loop."""
+        return await asyncio.to_thread(self._send_email_notification, *message)
+
+    async def send_fraud_alert(
+        self,
+        transaction: Dict,
+        anomaly_score: float,
+        channels: Optional[List[NotificationChannel]] = None
+    ) -> Dict[str, bool]:
+        """
+        Send fraud alert notification across configured channels concurrently.
+
+        Args:
+            transaction: Transaction data dictionary
+            anomaly_score: ML anomaly score (0-1)
+            channels: Specific channels to use (None = all enabled)
+
+        Returns:
+            Dictionary mapping channel name to success status
+        """
+        severity = self.determine_severity(anomaly_score, transaction.get('amount', 0))
+
+        # Only send notifications for HIGH and CRITICAL alerts
+        if severity not in [AlertSeverity.HIGH, AlertSeverity.CRITICAL]:
+            logger.debug(f"Alert severity {severity.value} below notification threshold - skipping")
+            return {}
+
+        # Use specified channels or all enabled channels
+        target_channels = channels if channels else self.enabled_channels
+        now = datetime.now()  # One clock read shared by every channel's message
+
+        sends = list(self.enabled_channels.intersection(target_channels))
+        outcomes = await asyncio.gather(
+            *(self._dispatch(channel, transaction, severity, anomaly_score, now) for channel in sends),
+            return_exceptions=True
+        )
+
+        results = {}
+        for channel, outcome in zip(sends, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to send notification via {channel.value}: {outcome}")
+                results[channel.value] = False
+            else:
+                results[channel.value] = outcome
 
         logger.info(f"Fraud alert sent: {transaction.get('transaction_id')} - Severity: {severity.value} - Channels: {list(results.keys())}")
 
@@ -474,6 +970,21 @@ def send_fraud_alert(transaction: Dict, anomaly_score: float) -> Dict[str, bool]
     return service.send_fraud_alert(transaction, anomaly_score)
 
 
+async def send_fraud_alert_async(transaction: Dict, anomaly_score: float) -> Dict[str, bool]:
+    """
+    Convenience coroutine to send a fraud alert from async code.
+
+    Args:
+        transaction: Transaction data
+        anomaly_score: Anomaly score (0-1)
+
+    Returns:
+        Dictionary of channel results
+    """
+    service = get_notification_service()
+    return await service.send_fraud_alert_async(transaction, anomaly_score)
+
+
 if __name__ == "__main__":
     # Test notification
     test_transaction = {
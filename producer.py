@@ -1,8 +1,10 @@
 import os
-import json
+import atexit
+import csv
+import mmap
 import time
 import logging
-import pandas as pd
+import orjson
 from kafka import KafkaProducer
 from kafka.errors import NoBrokersAvailable
 
@@ -18,6 +20,52 @@ KAFKA_BOOTSTRAP_SERVERS = os.environ.get("KAFKA_BOOTSTRAP_SERVERS", "localhost:9
 KAFKA_TOPIC = os.environ.get("KAFKA_TOPIC", "transactions_topic")
 CSV_FILE = 'transactions.csv'
 STREAM_DELAY_SECONDS = 1  # Delay between sending messages
+BATCH_MODE = os.environ.get("BATCH_MODE", "false").lower() in ("1", "true", "yes")  # Backfill without delay
+BATCH_FLUSH_EVERY = 1000  # Messages between flushes in batch mode
+LOG_EVERY = int(os.environ.get("PRODUCER_LOG_EVERY", 100))  # Log progress every N messages
+
+
+def _coerce_row(row):
+    """Convert the numeric CSV columns that csv.DictReader leaves as strings."""
+    row['amount'] = float(row['amount'])
+    row['is_fraud'] = int(row['is_fraud'])
+    return row
+
+
+def _on_send_error(transaction_id, exc):
+    logger.error(
+        "Failed to send transaction",
+        extra={'transaction_id': transaction_id, 'error': str(exc)}
+    )
+
+
+def _map_file(f):
+    """Memory-map an open file read-only (None for an empty file, which mmap rejects)."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def count_rows(path):
+    """Count data rows (excluding the header) without parsing the CSV."""
+    with open(path, 'rb') as f:
+        mm = _map_file(f)
+        if mm is None:
+            return 0
+        with mm:
+            return max(sum(1 for _ in iter(mm.readline, b'')) - 1, 0)
+
+
+def iter_transactions(path):
+    """Yield transactions from the CSV one row at a time through a memory map."""
+    with open(path, 'rb') as f:
+        mm = _map_file(f)
+        if mm is None:
+            return
+        with mm:
+            lines = (line.decode('utf-8') for line in iter(mm.readline, b''))
+            for row in csv.DictReader(lines):
+                yield _coerce_row(row)
 
 def create_producer():
     """Creates a Kafka producer, retrying if brokers are not available."""
@@ -25,7 +73,11 @@ def create_producer():
         try:
             producer = KafkaProducer(
                 bootstrap_servers=[KAFKA_BOOTSTRAP_SERVERS],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8')
+                value_serializer=orjson.dumps,  # Returns bytes directly
+                linger_ms=50,  # Wait briefly so sends are grouped into batches
+                batch_size=65536,
+                compression_type='lz4',
+                acks=1
             )
             logger.info(
                 "Kafka Producer connected successfully",
@@ -40,6 +92,28 @@ def create_producer():
             time.sleep(15) # Increased wait time
     raise ConnectionError("Could not connect to Kafka brokers after multiple retries.")
 
+# Singleton producer, reused by every stream in this process
+_producer = None
+
+
+def get_producer():
+    """Get the shared Kafka producer, connecting on first use."""
+    global _producer
+    if _producer is None:
+        _producer = create_producer()
+        atexit.register(_close_producer)
+    return _producer
+
+
+def _close_producer():
+    """Flush and close the shared producer at interpreter exit."""
+    global _producer
+    if _producer is not None:
+        _producer.flush()
+        _producer.close()
+        _producer = None
+        logger.info("Kafka producer closed")
+
 def stream_transactions():
     """Reads transactions from a CSV and streams them to a Kafka topic."""
 
@@ -48,44 +122,52 @@ def stream_transactions():
         logger.error(err_msg)
         raise FileNotFoundError(err_msg)
 
-    producer = create_producer()
+    producer = get_producer()
 
     try:
-        df = pd.read_csv(CSV_FILE)
-        total_transactions = len(df)
+        total_transactions = count_rows(CSV_FILE)
         logger.info(
             f"Starting to stream transactions",
             extra={
                 'total_transactions': total_transactions,
                 'source_file': CSV_FILE,
                 'topic': KAFKA_TOPIC,
-                'delay_seconds': STREAM_DELAY_SECONDS
+                'delay_seconds': 0 if BATCH_MODE else STREAM_DELAY_SECONDS,
+                'batch_mode': BATCH_MODE
             }
         )
 
-        for idx, row in df.iterrows():
-            transaction = row.to_dict()
-            producer.send(KAFKA_TOPIC, value=transaction)
-
-            logger.info(
-                f"Sent transaction ({idx+1}/{total_transactions})",
-                extra={
-                    'transaction_id': transaction['transaction_id'],
-                    'progress': f"{((idx+1)/total_transactions)*100:.1f}%"
-                }
+        idx = 0
+        for idx, transaction in enumerate(iter_transactions(CSV_FILE), 1):
+            # Key by account so each account's transactions stay ordered on one partition
+            future = producer.send(
+                KAFKA_TOPIC,
+                key=transaction['account_id'].encode('utf-8'),
+                value=transaction
             )
+
+            if BATCH_MODE:
+                future.add_errback(_on_send_error, transaction['transaction_id'])
+                if idx % BATCH_FLUSH_EVERY == 0:
+                    producer.flush()
+                    logger.info("Flushed transactions (%d/%d)", idx, total_transactions)
+                continue
+
+            if idx % LOG_EVERY == 0 or idx == total_transactions:
+                logger.info(
+                    "Sent transaction (%d/%d)", idx, total_transactions,
+                    extra={'transaction_id': transaction['transaction_id']}
+                )
             time.sleep(STREAM_DELAY_SECONDS)
 
-        producer.flush() # Ensure all messages are sent
-        logger.info("Finished streaming all transactions successfully")
+        logger.info("Finished streaming all transactions successfully", extra={'sent': idx})
 
     except Exception as e:
         logger.error("An error occurred during streaming", exc_info=True)
         raise
     finally:
-        if producer:
-            producer.close()
-            logger.info("Kafka producer closed")
+        # The shared producer stays open for later streams; it is closed at exit
+        producer.flush()
 
 if __name__ == "__main__":
     try:
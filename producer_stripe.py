@@ -4,10 +4,14 @@ Streams real payment transaction data from Stripe Test Mode to Kafka
 """
 
 import os
-import json
+import atexit
+import re
 import time
+import queue
 import logging
+import threading
 from datetime import datetime
+import orjson
 from kafka import KafkaProducer
 import stripe
 from dotenv import load_dotenv
@@ -27,6 +31,8 @@ KAFKA_BOOTSTRAP_SERVERS = os.environ.get("KAFKA_BOOTSTRAP_SERVERS", "localhost:9
 KAFKA_TOPIC = os.environ.get("KAFKA_TOPIC", "transactions_topic")
 STRIPE_API_KEY = os.environ.get("STRIPE_API_KEY", "sk_test_YOUR_KEY_HERE")  # Get from dashboard.stripe.com
 STREAM_DELAY_SECONDS = int(os.environ.get("STREAM_DELAY_SECONDS", 2))
+STRIPE_PAGE_SIZE = 100  # Maximum page size allowed by the Stripe list API
+STRIPE_PREFETCH_CHARGES = int(os.environ.get("STRIPE_PREFETCH_CHARGES", 500))  # Charges buffered ahead of Kafka
 
 # Initialize Stripe
 stripe.api_key = STRIPE_API_KEY
@@ -45,13 +51,20 @@ CATEGORY_MAPPING = {
     'gambling': 'Gambling'
 }
 
+# Single pass over a charge description instead of one substring scan per category
+_CATEGORY_RE = re.compile('|'.join(re.escape(key) for key in CATEGORY_MAPPING), re.IGNORECASE)
+
 def create_kafka_producer():
     """Creates a Kafka producer with retry logic."""
     for attempt in range(1, 6):
         try:
             producer = KafkaProducer(
                 bootstrap_servers=[KAFKA_BOOTSTRAP_SERVERS],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8')
+                value_serializer=orjson.dumps,  # Returns bytes directly
+                linger_ms=50,  # Wait briefly so sends are grouped into batches
+                batch_size=65536,
+                compression_type='lz4',
+                acks=1
             )
             logger.info("Kafka Producer connected successfully")
             return producer
@@ -60,90 +73,125 @@ def create_kafka_producer():
             time.sleep(10)
     raise ConnectionError("Could not connect to Kafka brokers after multiple retries.")
 
+# Singleton producer, reused by every stream in this process
+_producer = None
+
+
+def get_producer():
+    """Get the shared Kafka producer, connecting on first use."""
+    global _producer
+    if _producer is None:
+        _producer = create_kafka_producer()
+        atexit.register(_close_producer)
+    return _producer
+
+
+def _close_producer():
+    """Flush and close the shared producer at interpreter exit."""
+    global _producer
+    if _producer is not None:
+        _producer.flush()
+        _producer.close()
+        _producer = None
+        logger.info("Kafka producer closed")
+
 def fetch_stripe_transactions():
-    """Fetch transactions from Stripe API."""
-    try:
-        logger.info("Fetching transactions from Stripe Test Mode...")
+    """Yield charges from Stripe, following pagination on a background thread.
 
-        # Fetch charges (payments)
-        charges = stripe.Charge.list(limit=100)
+    auto_paging_iter() only requests the next page once the current one is
+    exhausted; running it on a worker thread that fills a bounded queue
+    overlaps page round-trips with streaming to Kafka.
+    """
+    logger.info("Fetching transactions from Stripe Test Mode...")
 
-        logger.info(f"Retrieved {len(charges.data)} charges from Stripe")
-        return charges.data
+    charges = queue.Queue(maxsize=STRIPE_PREFETCH_CHARGES)
+    done = object()
 
-    except stripe.error.AuthenticationError as e:
-        logger.error(f"Stripe authentication failed: {e}")
-        logger.error("Please set STRIPE_API_KEY environment variable with your test key from dashboard.stripe.com")
-        return []
-    except Exception as e:
-        logger.error(f"Error fetching Stripe data: {e}")
-        return []
+    def fetch_pages():
+        try:
+            for charge in stripe.Charge.list(limit=STRIPE_PAGE_SIZE).auto_paging_iter():
+                charges.put(charge)
+        except stripe.error.AuthenticationError as e:
+            logger.error(f"Stripe authentication failed: {e}")
+            logger.error("Please set STRIPE_API_KEY environment variable with your test key from dashboard.stripe.com")
+        except Exception as e:
+            logger.error(f"Error fetching Stripe data: {e}")
+        finally:
+            charges.put(done)
+
+    threading.Thread(target=fetch_pages, name="stripe-pages", daemon=True).start()
+
+    count = 0
+    while (charge := charges.get()) is not done:
+        count += 1
+        yield charge
+
+    logger.info(f"Retrieved {count} charges from Stripe")
 
 def convert_stripe_to_transaction(charge):
     """Convert Stripe charge to transaction format."""
 
+    # StripeObject attribute access goes through __getattr__; read each once
+    billing_details = charge.billing_details
+    metadata = charge.metadata
+    description = charge.description
+    outcome = charge.outcome
+    payment_method_details = charge.payment_method_details
+    charge_id = charge.id
+
     # Extract location from billing details or metadata
     location = "Unknown"
-    if charge.billing_details and charge.billing_details.address:
-        location = charge.billing_details.address.city or charge.billing_details.address.country or "Unknown"
+    address = billing_details.address if billing_details else None
+    if address:
+        location = address.city or address.country or "Unknown"
 
     # Get merchant category from metadata or description
     merchant_category = "Unknown"
-    if charge.metadata and 'category' in charge.metadata:
-        merchant_category = CATEGORY_MAPPING.get(charge.metadata['category'], charge.metadata['category'])
-    elif charge.description:
+    if metadata and 'category' in metadata:
+        category = metadata['category']
+        merchant_category = CATEGORY_MAPPING.get(category, category)
+    elif description:
         # Try to infer from description
-        desc_lower = charge.description.lower()
-        for key, value in CATEGORY_MAPPING.items():
-            if key in desc_lower:
-                merchant_category = value
-                break
+        match = _CATEGORY_RE.search(description)
+        if match:
+            merchant_category = CATEGORY_MAPPING[match.group(0).lower()]
 
     # Convert Stripe charge to our transaction format
     transaction = {
-        'transaction_id': f"STRIPE_{charge.id}",
-        'account_id': charge.customer or f"GUEST_{charge.id[:8]}",
+        'transaction_id': f"STRIPE_{charge_id}",
+        'account_id': charge.customer or f"GUEST_{charge_id[:8]}",
         'timestamp': datetime.fromtimestamp(charge.created).isoformat(),
         'amount': charge.amount / 100.0,  # Convert from cents to dollars
         'merchant_category': merchant_category,
         'location': location,
         'is_fraud': 0,  # Will be determined by our ML model
         # Additional Stripe-specific fields
-        'stripe_risk_score': charge.outcome.risk_score if charge.outcome else None,
-        'stripe_risk_level': charge.outcome.risk_level if charge.outcome else None,
-        'payment_method': charge.payment_method_details.type if charge.payment_method_details else None
+        'stripe_risk_score': outcome.risk_score if outcome else None,
+        'stripe_risk_level': outcome.risk_level if outcome else None,
+        'payment_method': payment_method_details.type if payment_method_details else None
     }
 
     return transaction
 
 def stream_stripe_transactions():
     """Stream Stripe transactions to Kafka."""
-    producer = create_kafka_producer()
+    producer = get_producer()
 
     try:
-        # Fetch transactions from Stripe
-        charges = fetch_stripe_transactions()
+        logger.info(f"Starting to stream Stripe transactions to Kafka topic '{KAFKA_TOPIC}'")
 
-        if not charges:
-            logger.warning("No transactions fetched from Stripe. Creating test charge...")
-            logger.info("To create test transactions in Stripe dashboard:")
-            logger.info("1. Go to https://dashboard.stripe.com/test/payments")
-            logger.info("2. Click 'Create payment' to generate test charges")
-            logger.info("3. Or use test card: 4242 4242 4242 4242")
-            return
-
-        logger.info(f"Starting to stream {len(charges)} Stripe transactions to Kafka topic '{KAFKA_TOPIC}'")
-
-        for idx, charge in enumerate(charges, 1):
+        sent = 0
+        for idx, charge in enumerate(fetch_stripe_transactions(), 1):
             try:
                 # Convert to our format
                 transaction = convert_stripe_to_transaction(charge)
 
                 # Send to Kafka
                 producer.send(KAFKA_TOPIC, value=transaction)
+                sent += 1
 
                 logger.info(
-                    f"Sent transaction ({idx}/{len(charges)}): {transaction['transaction_id']} - "
+                    f"Sent transaction ({idx}): {transaction['transaction_id']} - "
                     f"€{transaction['amount']:.2f} - {transaction['merchant_category']}"
                 )
 
@@ -154,14 +202,21 @@ def stream_stripe_transactions():
                 logger.error(f"Error processing charge {charge.id}: {e}")
                 continue
 
-        logger.info(f"Completed streaming {len(charges)} transactions from Stripe")
+        if not sent:
+            logger.warning("No transactions fetched from Stripe. Creating test charge...")
+            logger.info("To create test transactions in Stripe dashboard:")
+            logger.info("1. Go to https://dashboard.stripe.com/test/payments")
+            logger.info("2. Click 'Create payment' to generate test charges")
+            logger.info("3. Or use test card: 4242 4242 4242 4242")
+            return
+
+        logger.info(f"Completed streaming {sent} transactions from Stripe")
 
     except KeyboardInterrupt:
         logger.info("Stream interrupted by user")
     finally:
+        # The shared producer stays open for later streams; it is closed at exit
         producer.flush()
-        producer.close()
-        logger.info("Kafka producer closed")
 
 def create_test_stripe_charge():
     """Create a test charge in Stripe for demonstration."""
@@ -22,6 +22,7 @@ import time
 import argparse
 import logging
 import subprocess
+import multiprocessing
 from datetime import datetime
 import schedule
 
@@ -36,6 +37,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+RETRAINING_TIMEOUT_SECONDS = 3600  # 1 hour timeout
+
+# Single long-lived worker process: retrain_model and its pandas/sklearn/mlflow imports are
+# loaded once and stay warm between weekly runs, while a stuck run can still be killed
+_retrain_pool = None
+
+
+def _get_retrain_pool():
+    """Get the retraining worker pool, starting it on first use."""
+    global _retrain_pool
+    if _retrain_pool is None:
+        _retrain_pool = multiprocessing.Pool(processes=1)
+    return _retrain_pool
+
+
+def _reset_retrain_pool():
+    """Kill the retraining worker (e.g. after a timeout); the next run starts a fresh one."""
+    global _retrain_pool
+    if _retrain_pool is not None:
+        _retrain_pool.terminate()
+        _retrain_pool.join()
+        _retrain_pool = None
+
+
+def _retrain_in_worker(lookback_days):
+    """Runs retrain_pipeline in the worker and returns its exit code (it calls sys.exit on failure)."""
+    from retrain_model import retrain_pipeline
+
+    try:
+        retrain_pipeline(lookback_days=lookback_days)
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
 
 def run_weekly_retraining():
     """Runs weekly model retraining."""
@@ -44,24 +79,20 @@ def run_weekly_retraining():
     logger.info("=" * 60)
 
     try:
-        # Run retraining with 90 days lookback
-        result = subprocess.run(
-            ['python', 'retrain_model.py', '--lookback-days', '90'],
-            capture_output=True,
-            text=True,
-            timeout=3600  # 1 hour timeout
+        # Run retraining with 90 days lookback (the pipeline logs its own progress)
+        exit_code = _get_retrain_pool().apply_async(_retrain_in_worker, (90,)).get(
+            timeout=RETRAINING_TIMEOUT_SECONDS
         )
 
-        if result.returncode == 0:
+        if exit_code == 0:
             logger.info("Weekly retraining completed successfully")
-            logger.info(result.stdout)
         else:
-            logger.error(f"Weekly retraining failed with code {result.returncode}")
-            logger.error(result.stderr)
+            logger.error(f"Weekly retraining failed with code {exit_code}")
             # TODO: Send alert notification
 
-    except subprocess.TimeoutExpired:
+    except multiprocessing.TimeoutError:
         logger.error("Weekly retraining timed out after 1 hour")
+        _reset_retrain_pool()
         # TODO: Send alert notification
 
     except Exception as e:
@@ -135,6 +166,9 @@ def main():
     except KeyboardInterrupt:
         logger.info("Scheduler stopped by user")
 
+    finally:
+        _reset_retrain_pool()
+
 
 if __name__ == "__main__":
     main()
@@ -60,7 +60,9 @@ def test_stripe_connection():
     # Try to fetch some charges
     print("Fetching recent test transactions...")
     try:
-        charges = stripe.Charge.list(limit=5)
+        # One round trip with the API's maximum page size: enough to count what the
+        # producer will find (it pages through the rest with auto_paging_iter)
+        charges = stripe.Charge.list(limit=100)
 
         if len(charges.data) == 0:
             print("⚠️  No transactions found in Stripe test mode")
@@ -71,8 +73,9 @@ def test_stripe_connection():
             print("4. Create 5-10 test payments with different amounts")
             print()
         else:
-            print(f"✅ Found {len(charges.data)} test transactions:")
-            for idx, charge in enumerate(charges.data, 1):
+            more = "+" if charges.has_more else ""
+            print(f"✅ Found {len(charges.data)}{more} test transactions, most recent:")
+            for idx, charge in enumerate(charges.data[:5], 1):
                 amount = charge.amount / 100
                 status = charge.status
                 created = charge.created
@@ -1,15 +1,38 @@
 """Unit tests for detection_logic.py"""
+import warnings
+
+import numpy as np
 import pytest
-from detection_logic import score_transaction
+from sklearn.ensemble import IsolationForest
+
+from detection_logic import _build_features, score_transaction, score_transaction_raw
+
+# Keep every consumer of the session-scoped mock_model on one worker under
+# `pytest -n auto --dist=loadgroup`, so the model is fit once rather than once per worker
+pytestmark = pytest.mark.xdist_group("model_session")
 
 
 class TestScoreTransaction:
     """Test suite for transaction scoring logic."""
 
-    def test_normal_transaction_low_score(self, sample_transaction, sample_aggregates, mock_model):
-        """Test that normal transactions receive low anomaly scores."""
+    @pytest.mark.parametrize("overrides,expected_reasons,max_score", [
+        pytest.param({}, None, 0.7, id="normal"),
+        pytest.param(
+            {'transaction_id': 'TEST_002', 'timestamp': '2024-01-15 11:30:00',
+             'amount': 8000.00, 'merchant_category': 'Electronics'},
+            ("High Value", "ML"), None, id="high_value"
+        ),
+        pytest.param(
+            {'transaction_id': 'TEST_003', 'timestamp': '2024-01-15 12:30:00',
+             'amount': 100.00, 'merchant_category': 'Gambling', 'location': 'Turku'},  # Not Helsinki
+            ("Suspicious Combo", "ML"), None, id="suspicious_gambling_combo"
+        ),
+    ])
+    def test_score_cases(self, overrides, expected_reasons, max_score,
+                         sample_transaction, sample_aggregates, mock_model):
+        """Test that normal transactions score low and risky ones are flagged with the expected reason."""
         score, reason = score_transaction(
-            sample_transaction,
+            {**sample_transaction, **overrides},
             sample_aggregates,
             mock_model,
             min_score=-0.5,
@@ -17,33 +40,12 @@ class TestScoreTransaction:
         )
 
         assert 0.0 <= score <= 1.0, "Score should be normalized between 0 and 1"
-        assert score < 0.7, "Normal transaction should have low anomaly score"
-
-    def test_high_value_transaction_flagged(self, high_value_transaction, sample_aggregates, mock_model):
-        """Test that high-value transactions are flagged correctly."""
-        score, reason = score_transaction(
-            high_value_transaction,
-            sample_aggregates,
-            mock_model,
-            min_score=-0.5,
-            max_score=0.5
-        )
-
-        assert reason is not None, "High-value transaction should trigger an alert"
-        assert "High Value" in reason or "ML" in reason, "Should flag high value or ML risk"
-
-    def test_suspicious_gambling_combo(self, suspicious_transaction, sample_aggregates, mock_model):
-        """Test suspicious merchant + location combination."""
-        score, reason = score_transaction(
-            suspicious_transaction,
-            sample_aggregates,
-            mock_model,
-            min_score=-0.5,
-            max_score=0.5
-        )
-
-        assert reason is not None, "Suspicious combo should trigger alert"
-        assert "Suspicious Combo" in reason or "ML" in reason, "Should flag suspicious combination"
+        if max_score is not None:
+            assert score < max_score, "Normal transaction should have low anomaly score"
+        if expected_reasons is not None:
+            assert reason is not None, "Risky transaction should trigger an alert"
+            assert any(expected in reason for expected in expected_reasons), \
+                f"Reason should mention one of {expected_reasons}"
 
     def test_high_deviation_flagged(self, sample_transaction, mock_model):
         """Test that transactions with high deviation from average are flagged."""
@@ -100,3 +102,37 @@ class TestScoreTransaction:
                 min_score=None,
                 max_score=0.5
             )
+
+
+class TestScoreTransactionRaw:
+    """Test suite for scoring prepared feature rows."""
+
+    def test_matches_score_transaction(self, sample_transaction, sample_aggregates, mock_model):
+        """Test that scoring a prepared row gives the same score as the dict entry point."""
+        expected, _ = score_transaction(sample_transaction, sample_aggregates, mock_model, -0.5, 0.5)
+
+        features = _build_features(sample_transaction, sample_aggregates)
+
+        assert score_transaction_raw(features, mock_model, -0.5, 0.5) == pytest.approx(expected)
+
+    def test_feature_row_reused(self, sample_transaction, sample_aggregates):
+        """Test that each thread fills one preallocated float32 row."""
+        first = _build_features(sample_transaction, sample_aggregates)
+        second = _build_features({**sample_transaction, 'amount': 300.0}, sample_aggregates)
+
+        assert second is first
+        assert first.dtype == np.float32 and first.shape == (1, 3)
+        np.testing.assert_allclose(first[0], [300.0, 150.0, 1.0], rtol=1e-5)
+
+    def test_unnamed_model_scored_without_frame(self, sample_transaction, sample_aggregates):
+        """Test that models fit on plain arrays score the row directly, without name warnings."""
+        model = IsolationForest(random_state=42).fit(
+            np.array([[100, 120, 0.1], [150, 120, 0.2], [200, 120, 0.3]], dtype=np.float32)
+        )
+        features = _build_features(sample_transaction, sample_aggregates)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            score = score_transaction_raw(features, model, -0.5, 0.5)
+
+        assert score == pytest.approx(1 - (model.decision_function(features)[0] + 0.5))
@@ -0,0 +1,326 @@
+"""Unit tests for detection_service.py"""
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import detection_service
+from detection_service import (
+    INSERT_COLUMNS,
+    _cache_model,
+    _copy_value,
+    _load_cached_model,
+    dispatch_fraud_alert,
+    insert_transactions,
+    merge_batch_aggregates,
+    process_transaction_batch,
+    validate_batch,
+    validate_transaction,
+)
+
+
+def _transaction(**overrides):
+    transaction = {
+        'transaction_id': 'TEST_001',
+        'account_id': 'ACC_0001',
+        'timestamp': '2024-01-15T10:30:00',
+        'amount': 150.00,
+        'merchant_category': 'Groceries',
+        'location': 'Helsinki',
+        'is_fraud': 0
+    }
+    transaction.update(overrides)
+    return transaction
+
+
+class TestValidateBatch:
+    """Test suite for columnar batch validation."""
+
+    def test_valid_batch_kept(self):
+        """Test that valid transactions pass with no error messages."""
+        keep, errors = validate_batch([_transaction(), _transaction(transaction_id='TEST_002')])
+
+        assert keep.tolist() == [True, True]
+        assert errors == ['', '']
+
+    def test_missing_field_rejected(self):
+        """Test that missing or null required fields are reported per transaction."""
+        missing = _transaction()
+        del missing['location']
+
+        keep, errors = validate_batch([_transaction(), missing, _transaction(account_id=None)])
+
+        assert keep.tolist() == [True, False, False]
+        assert errors[1] == "Missing required field: location"
+        assert errors[2] == "Missing required field: account_id"
+
+    @pytest.mark.parametrize("amount", ["abc", None, float('nan')])
+    def test_unparseable_amount_rejected(self, amount):
+        """Test that non-numeric and NaN amounts are rejected."""
+        keep, errors = validate_batch([_transaction(amount=amount)])
+
+        assert keep.tolist() == [False]
+        assert errors[0].startswith("Missing required field") or errors[0].startswith("Invalid amount format")
+
+    @pytest.mark.parametrize("amount", [0, -25.5])
+    def test_non_positive_amount_rejected(self, amount):
+        """Test that zero and negative amounts are rejected with the original value."""
+        keep, errors = validate_batch([_transaction(amount=amount)])
+
+        assert keep.tolist() == [False]
+        assert errors[0] == f"Invalid amount: {float(amount)} (must be positive)"
+
+    def test_extreme_amounts_not_rounded(self):
+        """Test that validation does not depend on float32 rounding."""
+        keep, _ = validate_batch([_transaction(amount=1e39), _transaction(amount=1e-46)])
+
+        assert keep.tolist() == [True, True]
+
+    def test_timestamp_parsed_once(self):
+        """Test that ISO-8601 timestamps are replaced by datetime objects."""
+        batch = [_transaction(), _transaction(timestamp='2024-01-15 10:30:00')]
+
+        keep, _ = validate_batch(batch)
+
+        assert keep.tolist() == [True, True]
+        assert batch[0]['timestamp'] == datetime(2024, 1, 15, 10, 30)
+        assert batch[1]['timestamp'] == datetime(2024, 1, 15, 10, 30)
+
+    def test_invalid_timestamp_rejected(self):
+        """Test that unparseable timestamps are rejected before they reach COPY."""
+        keep, errors = validate_batch([_transaction(timestamp='yesterday')])
+
+        assert keep.tolist() == [False]
+        assert errors[0] == "Invalid timestamp format: yesterday"
+
+    def test_empty_batch(self):
+        """Test that an empty batch yields an empty mask."""
+        keep, errors = validate_batch([])
+
+        assert len(keep) == 0
+        assert errors == []
+
+
+class TestValidateTransaction:
+    """Test suite for the single-transaction validation wrapper."""
+
+    def test_returns_bool_and_message(self):
+        """Test that validate_transaction keeps its (bool, str) contract."""
+        assert validate_transaction(_transaction()) == (True, "")
+
+        is_valid, error_msg = validate_transaction(_transaction(amount=-1))
+        assert is_valid is False
+        assert isinstance(error_msg, str) and "must be positive" in error_msg
+
+
+class TestCopyValue:
+    """Test suite for COPY text-format escaping."""
+
+    def test_none_is_null_marker(self):
+        assert _copy_value(None) == r'\N'
+
+    @pytest.mark.parametrize("value,expected", [
+        ("a\tb", "a\\tb"),
+        ("a\nb", "a\\nb"),
+        ("a\rb", "a\\rb"),
+        ("a\\b", "a\\\\b"),
+        (12.5, "12.5"),
+    ])
+    def test_special_characters_escaped(self, value, expected):
+        assert _copy_value(value) == expected
+
+
+def _mock_db_conn():
+    db_conn = MagicMock()
+    cursor = db_conn.connection.cursor.return_value
+    cursor.copied = []
+    cursor.copy_from.side_effect = lambda buffer, table, columns: cursor.copied.append(buffer.getvalue())
+    return db_conn, cursor
+
+
+class TestInsertTransactions:
+    """Test suite for the COPY-based bulk insert."""
+
+    def test_row_layout_matches_insert_columns(self):
+        """Test that each record becomes one tab-separated line in INSERT_COLUMNS order."""
+        db_conn, cursor = _mock_db_conn()
+        record = _transaction(ml_anomaly_score=0.25, alert_reason=None, is_anomaly=0, status=None)
+
+        failed = insert_transactions([record, _transaction(transaction_id='TEST_002')], db_conn)
+
+        assert failed == []
+        assert cursor.copy_from.call_count == 1
+        _, table = cursor.copy_from.call_args.args
+        assert table == detection_service.TABLE_NAME
+        assert cursor.copy_from.call_args.kwargs['columns'] == INSERT_COLUMNS
+
+        lines = cursor.copied[0].splitlines()
+        assert len(lines) == 2
+        fields = lines[0].split('\t')
+        assert fields == [_copy_value(record.get(column)) for column in INSERT_COLUMNS]
+        assert fields[INSERT_COLUMNS.index('alert_reason')] == r'\N'
+        assert lines[1].split('\t')[INSERT_COLUMNS.index('ml_anomaly_score')] == r'\N'
+
+    def test_bad_row_dropped_without_losing_batch(self):
+        """Test that a failing COPY is retried row by row and only bad rows are dropped."""
+        db_conn, cursor = _mock_db_conn()
+        good, bad = _transaction(), _transaction(transaction_id='TEST_BAD')
+
+        def copy_from(buffer, table, columns):
+            if 'TEST_BAD' in buffer.getvalue():
+                raise ValueError("duplicate key")
+            cursor.copied.append(buffer.getvalue())
+        cursor.copy_from.side_effect = copy_from
+
+        failed = insert_transactions([good, bad], db_conn)
+
+        assert [record for record, _ in failed] == [bad]
+        assert len(cursor.copied) == 1 and 'TEST_001' in cursor.copied[0]
+        executed = [call.args[0] for call in cursor.execute.call_args_list]
+        assert "ROLLBACK TO SAVEPOINT transaction_batch" in executed
+        assert "ROLLBACK TO SAVEPOINT transaction_row" in executed
+
+
+class TestProcessTransactionBatch:
+    """Test suite for batch scoring and persistence."""
+
+    @pytest.fixture(autouse=True)
+    def _stub_scoring(self, monkeypatch):
+        self.seen_aggregates = []
+
+        self.alerts = []
+
+        def get_aggregates(account_id, conn):
+            if account_id == 'ACC_BROKEN':
+                raise OperationalError("SELECT", {}, Exception("lookup failed"))
+            return {"account_tx_count": 10, "account_avg_amount": 100.0}
+
+        def score(transaction, aggregates, *args):
+            self.seen_aggregates.append(aggregates)
+            if transaction['amount'] >= 5000:
+                return 0.9, "High Value"
+            return 0.1, None
+
+        monkeypatch.setattr(detection_service, 'get_account_aggregates', get_aggregates)
+        monkeypatch.setattr(detection_service, 'score_transaction', score)
+        monkeypatch.setattr(
+            detection_service, 'dispatch_fraud_alert',
+            lambda transaction, score: self.alerts.append(transaction['transaction_id'])
+        )
+
+    def test_copy_failure_rolls_back(self):
+        """Test that a database failure during insert rolls back and reports the batch as failed."""
+        db_conn, cursor = _mock_db_conn()
+        cursor.execute.side_effect = RuntimeError("connection lost")
+
+        assert process_transaction_batch([_transaction()], db_conn) is False
+        db_conn.rollback.assert_called_once()
+
+    def test_batch_persisted(self):
+        """Test that valid transactions are written and invalid ones are skipped."""
+        db_conn, cursor = _mock_db_conn()
+
+        assert process_transaction_batch([_transaction(), _transaction(amount=-5)], db_conn) is True
+        assert len(cursor.copied[0].splitlines()) == 1
+        db_conn.rollback.assert_not_called()
+
+    def test_failed_row_does_not_end_batch_transaction(self):
+        """Test that a failing row is skipped inside a savepoint and the rest of the batch is committed."""
+        db_conn, cursor = _mock_db_conn()
+        db_conn.in_transaction.return_value = False
+        batch = [_transaction(), _transaction(transaction_id='TEST_BAD', account_id='ACC_BROKEN'),
+                 _transaction(transaction_id='TEST_003')]
+
+        assert process_transaction_batch(batch, db_conn) is True
+
+        db_conn.begin.assert_called_once()
+        db_conn.rollback.assert_not_called()
+        assert db_conn.begin_nested.call_count == 3
+        lines = cursor.copied[0].splitlines()
+        assert [line.split('\t')[0] for line in lines] == ['TEST_001', 'TEST_003']
+        # Committed before returning, i.e. before main acknowledges the Kafka offsets
+        db_conn.commit.assert_called_once()
+
+    def test_alerts_sent_after_commit(self):
+        """Test that fraud alerts are dispatched only for committed rows."""
+        db_conn, _ = _mock_db_conn()
+        db_conn.commit.side_effect = lambda: self.alerts.append('COMMIT')
+
+        process_transaction_batch([_transaction(amount=8000.0), _transaction(transaction_id='TEST_002')], db_conn)
+
+        assert self.alerts == ['COMMIT', 'TEST_001']
+
+    def test_no_alerts_when_write_fails(self):
+        """Test that a batch that will be redelivered sends no alerts."""
+        db_conn, cursor = _mock_db_conn()
+        cursor.execute.side_effect = RuntimeError("connection lost")
+
+        assert process_transaction_batch([_transaction(amount=8000.0)], db_conn) is False
+        assert self.alerts == []
+
+    def test_aggregates_include_earlier_batch_transactions(self):
+        """Test that a burst from one account is scored against a running average."""
+        db_conn, _ = _mock_db_conn()
+        burst = [_transaction(transaction_id=f'TEST_{i}', amount=1000.0) for i in range(3)]
+
+        process_transaction_batch(burst, db_conn)
+
+        assert [a['account_tx_count'] for a in self.seen_aggregates] == [10, 11, 12]
+        assert self.seen_aggregates[2]['account_avg_amount'] == pytest.approx((100.0 * 10 + 2000.0) / 12)
+
+
+class TestMergeBatchAggregates:
+    """Test suite for merging in-batch totals into database aggregates."""
+
+    def test_no_pending_returns_db_aggregates(self):
+        aggregates = {"account_tx_count": 5, "account_avg_amount": 50.0}
+        assert merge_batch_aggregates(aggregates, None) is aggregates
+
+    def test_new_account(self):
+        merged = merge_batch_aggregates({"account_tx_count": 0, "account_avg_amount": 0.0}, (2, 300.0))
+        assert merged == {"account_tx_count": 2, "account_avg_amount": 150.0}
+
+
+class TestDispatchFraudAlert:
+    """Test suite for background fraud alert dispatch."""
+
+    def test_alert_sent_off_thread(self, monkeypatch):
+        """Test that alerts are sent on the notification pool with a copy of the transaction."""
+        sent = threading.Event()
+        calls = []
+
+        def fake_send(transaction, score):
+            calls.append((transaction, score, threading.current_thread().name))
+            sent.set()
+            return {'slack': True}
+
+        monkeypatch.setattr(detection_service, 'send_fraud_alert', fake_send)
+        transaction = _transaction()
+
+        dispatch_fraud_alert(transaction, 0.95)
+
+        assert sent.wait(timeout=5)
+        sent_transaction, score, thread_name = calls[0]
+        assert sent_transaction == transaction and sent_transaction is not transaction
+        assert score == 0.95
+        assert thread_name.startswith("fraud-alert")
+
+
+@pytest.mark.xdist_group("model_session")
+class TestModelCache:
+    """Test suite for the local model cache."""
+
+    def test_round_trip(self, tmp_path, monkeypatch, mock_model):
+        """Test that a cached model and its score boundaries are loaded back by version."""
+        monkeypatch.setattr(detection_service, 'MODEL_CACHE_DIR', str(tmp_path))
+
+        assert _load_cached_model("3") is None
+
+        _cache_model("3", mock_model, -0.2, 0.3)
+        model, min_score, max_score = _load_cached_model("3")
+
+        assert (min_score, max_score) == (-0.2, 0.3)
+        assert model.get_params() == mock_model.get_params()
+        assert _load_cached_model("4") is None
@@ -0,0 +1,356 @@
+"""Unit tests for notification_service.py"""
+import asyncio
+import json
+import threading
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import notification_service
+from notification_service import AsyncNotificationService, NotificationChannel, NotificationService
+
+NOW = datetime(2024, 1, 15, 10, 31, 5)
+
+
+@pytest.fixture
+def webhook_urls(monkeypatch):
+    """Configure all webhook channels with dummy URLs."""
+    urls = {
+        'SLACK_WEBHOOK_URL': 'https://hooks.slack.test/services/T/B/X',
+        'DISCORD_WEBHOOK_URL': 'https://discord.test/api/webhooks/1/abc',
+        'TEAMS_WEBHOOK_URL': 'https://teams.test/webhook/abc',
+        'CUSTOM_WEBHOOK_URL': 'https://custom.test/fraud',
+    }
+    for name, url in urls.items():
+        monkeypatch.setattr(notification_service, name, url)
+    return urls
+
+
+@pytest.fixture
+def service(webhook_urls, monkeypatch):
+    """Notification service whose HTTP session records posts instead of sending them."""
+    monkeypatch.setattr(notification_service, 'ALERT_COALESCE_WINDOW_MS', 0)
+    svc = NotificationService()
+    svc._session = MagicMock()
+    svc._session.post.return_value.status_code = 200
+    yield svc
+    svc.close()
+
+
+@pytest.fixture
+def alert_transaction():
+    """High-value transaction that triggers a notification."""
+    return {
+        'transaction_id': 'TRX_TEST_001',
+        'account_id': 'ACC_TEST',
+        'amount': 9500.0,
+        'merchant_category': 'Gambling',
+        'location': 'Unknown',
+        'timestamp': '2024-01-15T10:30:00',
+        'alert_reason': 'High Value'
+    }
+
+
+class TestSendFraudAlert:
+    """Test suite for multi-channel alert dispatch."""
+
+    def test_all_enabled_webhooks_sent(self, service, webhook_urls, alert_transaction):
+        """Test that every configured webhook channel receives one post."""
+        results = service.send_fraud_alert(alert_transaction, anomaly_score=0.95)
+
+        assert results == {'slack': True, 'discord': True, 'teams': True, 'webhook': True}
+        posted_urls = sorted(call.args[0] for call in service._session.post.call_args_list)
+        assert posted_urls == sorted(webhook_urls.values())
+
+    def test_low_severity_skipped(self, service, alert_transaction):
+        """Test that alerts below HIGH severity are not sent."""
+        alert_transaction['amount'] = 10.0
+
+        assert service.send_fraud_alert(alert_transaction, anomaly_score=0.3) == {}
+        service._session.post.assert_not_called()
+
+    def test_channels_sent_concurrently(self, service, alert_transaction):
+        """Test that channels are dispatched in parallel rather than one after another."""
+        barrier = threading.Barrier(4, timeout=5)
+
+        def post(*args, **kwargs):
+            barrier.wait()  # Only passes if all four channels are in flight at once
+            return MagicMock(status_code=200)
+
+        service._session.post.side_effect = post
+
+        results = service.send_fraud_alert(alert_transaction, anomaly_score=0.95)
+
+        assert all(results.values()) and len(results) == 4
+
+    def test_specific_channel_only(self, service, alert_transaction):
+        """Test that an explicit channel list limits the dispatch."""
+        results = service.send_fraud_alert(
+            alert_transaction, anomaly_score=0.95, channels=[NotificationChannel.SLACK]
+        )
+
+        assert results == {'slack': True}
+
+    def test_requested_channel_not_configured(self, service, alert_transaction):
+        """Test that explicitly requested but unconfigured channels are ignored."""
+        results = service.send_fraud_alert(
+            alert_transaction,
+            anomaly_score=0.95,
+            channels=[NotificationChannel.SLACK, NotificationChannel.EMAIL]
+        )
+
+        assert results == {'slack': True}
+
+
+class TestAlertCoalescing:
+    """Test suite for batching Slack/Discord alerts during bursts."""
+
+    @pytest.fixture
+    def coalescing_service(self, service, monkeypatch):
+        monkeypatch.setattr(notification_service, 'ALERT_COALESCE_WINDOW_MS', 60_000)
+        return service
+
+    def _posts_to(self, service, url):
+        return [json.loads(call.kwargs['data'])
+                for call in service._session.post.call_args_list if call.args[0] == url]
+
+    def test_burst_posted_once_per_channel(self, coalescing_service, webhook_urls, alert_transaction):
+        """Test that alerts in one window become a single Slack and a single Discord post."""
+        for i in range(3):
+            alert_transaction['transaction_id'] = f'TRX_{i}'
+            results = coalescing_service.send_fraud_alert(alert_transaction, anomaly_score=0.95)
+            assert results['slack'] and results['discord']
+
+        assert self._posts_to(coalescing_service, webhook_urls['SLACK_WEBHOOK_URL']) == []
+        coalescing_service._flush_pending()
+
+        slack = self._posts_to(coalescing_service, webhook_urls['SLACK_WEBHOOK_URL'])
+        discord = self._posts_to(coalescing_service, webhook_urls['DISCORD_WEBHOOK_URL'])
+        assert len(slack) == 1 and len(slack[0]['attachments']) == 3
+        assert len(discord) == 1 and len(discord[0]['embeds']) == 3
+        assert len(self._posts_to(coalescing_service, webhook_urls['TEAMS_WEBHOOK_URL'])) == 3
+
+    def test_full_batch_sent_without_waiting(self, coalescing_service, webhook_urls, alert_transaction):
+        """Test that Discord posts as soon as its 10-embed limit is reached."""
+        for _ in range(10):
+            coalescing_service.send_fraud_alert(
+                alert_transaction, anomaly_score=0.95, channels=[NotificationChannel.DISCORD]
+            )
+        coalescing_service._pool.shutdown(wait=True)
+
+        discord = self._posts_to(coalescing_service, webhook_urls['DISCORD_WEBHOOK_URL'])
+        assert len(discord) == 1 and len(discord[0]['embeds']) == 10
+
+    def test_single_alert_keeps_original_message(self, coalescing_service, webhook_urls, alert_transaction):
+        """Test that a lone alert is posted unchanged when its window closes."""
+        coalescing_service.send_fraud_alert(
+            alert_transaction, anomaly_score=0.95, channels=[NotificationChannel.SLACK]
+        )
+        coalescing_service._flush_pending()
+
+        [slack] = self._posts_to(coalescing_service, webhook_urls['SLACK_WEBHOOK_URL'])
+        assert slack['text'].endswith("*Fraud Alert - CRITICAL*")
+
+
+class TestHTTPSession:
+    """Test suite for the shared webhook session."""
+
+    def test_adapter_retries_rate_limited_posts(self, webhook_urls):
+        """Test that webhook adapters retry POSTs on 429/5xx and honour Retry-After."""
+        svc = NotificationService()
+        try:
+            retries = svc._session.get_adapter(webhook_urls['SLACK_WEBHOOK_URL']).max_retries
+        finally:
+            svc.close()
+
+        assert retries.total == 3
+        assert 'POST' in retries.allowed_methods
+        assert {429, 503} <= set(retries.status_forcelist)
+        assert retries.respect_retry_after_header
+
+
+class TestMessageFormatting:
+    """Test suite for the cached message skeletons and orjson payloads."""
+
+    def test_slack_payload_posted_as_json_bytes(self, service, alert_transaction):
+        """Test that Slack receives pre-serialized JSON bytes with the filled field values."""
+        service.send_fraud_alert(
+            alert_transaction, anomaly_score=0.95, channels=[NotificationChannel.SLACK]
+        )
+
+        kwargs = service._session.post.call_args.kwargs
+        assert isinstance(kwargs['data'], bytes)
+        assert kwargs['headers'] == {"Content-Type": "application/json"}
+        fields = json.loads(kwargs['data'])['attachments'][0]['fields']
+        assert fields[0] == {"title": "Transaction ID", "short": True, "value": "TRX_TEST_001"}
+        assert fields[2]['value'] == "€9500.00"
+
+    def test_templates_match_message_layout(self, service, alert_transaction):
+        """Test that pre-encoded templates render the same JSON structure as the original dicts."""
+        high = notification_service.AlertSeverity.HIGH
+
+        discord = json.loads(service._format_discord_message(alert_transaction, high, 0.9, NOW))
+        teams = json.loads(service._format_teams_message(alert_transaction, high, 0.9, NOW))
+
+        embed = discord['embeds'][0]
+        assert embed['title'] == "🚨 Fraud Alert - HIGH"
+        assert embed['color'] == 16737792
+        assert {"name": "Anomaly Score", "value": "90.00%", "inline": True} in embed['fields']
+        assert 'Timestamp' not in [field['name'] for field in embed['fields']]
+        assert teams['sections'][0]['facts'][0] == {"name": "Transaction ID", "value": "TRX_TEST_001"}
+        assert teams['summary'] == "Fraud Alert - HIGH"
+        assert embed['timestamp'] == NOW.isoformat()
+
+    def test_one_clock_read_per_alert(self, service, webhook_urls, alert_transaction):
+        """Test that every channel of one alert carries the same timestamp."""
+        service.send_fraud_alert(alert_transaction, anomaly_score=0.95)
+
+        posts = {call.args[0]: json.loads(call.kwargs['data']) for call in service._session.post.call_args_list}
+        slack_ts = posts[webhook_urls['SLACK_WEBHOOK_URL']]['attachments'][0]['ts']
+        discord_ts = posts[webhook_urls['DISCORD_WEBHOOK_URL']]['embeds'][0]['timestamp']
+        webhook_ts = posts[webhook_urls['CUSTOM_WEBHOOK_URL']]['timestamp']
+        assert discord_ts == webhook_ts
+        assert slack_ts == int(datetime.fromisoformat(discord_ts).timestamp())
+
+    def test_values_are_json_escaped(self, service, alert_transaction):
+        """Test that spliced values are encoded, not pasted raw into the template."""
+        alert_transaction['location'] = 'Quote " and \\ backslash'
+        high = notification_service.AlertSeverity.HIGH
+
+        slack = json.loads(service._format_slack_message(alert_transaction, high, 0.9, NOW))
+
+        fields = {field['title']: field['value'] for field in slack['attachments'][0]['fields']}
+        assert fields['Location'] == 'Quote " and \\ backslash'
+
+    def test_numpy_values_serialized(self):
+        """Test that numpy scalars from the scoring path serialize without conversion."""
+        import numpy as np
+
+        assert json.loads(notification_service._dumps({"score": np.float64(0.5)})) == {"score": 0.5}
+
+
+class TestAsyncNotificationService:
+    """Test suite for the asyncio dispatch path."""
+
+    def test_all_enabled_webhooks_sent(self, webhook_urls, alert_transaction):
+        """Test that the async service awaits one post per configured webhook."""
+        async def run():
+            svc = AsyncNotificationService()
+            await svc._client.aclose()
+            svc._client = MagicMock()
+            svc._client.post = AsyncMock(return_value=MagicMock(status_code=200))
+            try:
+                results = await svc.send_fraud_alert(alert_transaction, anomaly_score=0.95)
+            finally:
+                svc.close()
+            return svc, results
+
+        svc, results = asyncio.run(run())
+
+        assert results == {'slack': True, 'discord': True, 'teams': True, 'webhook': True}
+        posted_urls = sorted(call.args[0] for call in svc._client.post.call_args_list)
+        assert posted_urls == sorted(webhook_urls.values())
+
+
+class TestSendFraudAlertAsync:
+    """Test suite for the aiohttp/aiosmtplib dispatch path."""
+
+    class FakeAioSession:
+        closed = False
+
+        def __init__(self):
+            self.posts = []
+
+        def post(self, url, data, headers):
+            self.posts.append((url, json.loads(data)))
+            response = MagicMock()
+            response.__aenter__ = AsyncMock(return_value=response)
+            response.__aexit__ = AsyncMock(return_value=False)
+            return response
+
+    def test_all_channels_awaited(self, service, webhook_urls, alert_transaction, monkeypatch):
+        """Test that webhooks post on the shared aiohttp session and email uses aiosmtplib."""
+        monkeypatch.setattr(notification_service, 'SMTP_USERNAME', 'alerts')
+        monkeypatch.setattr(notification_service, 'SMTP_PASSWORD', 'secret')
+        smtp_send = AsyncMock()
+        monkeypatch.setattr(notification_service.aiosmtplib, 'send', smtp_send)
+        service.enabled_channels = frozenset(service._detect_enabled_channels())
+        service._aio_session = self.FakeAioSession()
+
+        results = asyncio.run(service.send_fraud_alert_async(alert_transaction, anomaly_score=0.95))
+
+        assert results == {'slack': True, 'discord': True, 'teams': True, 'webhook': True, 'email': True}
+        assert sorted(url for url, _ in service._aio_session.posts) == sorted(webhook_urls.values())
+        service._session.post.assert_not_called()
+        assert smtp_send.await_args.kwargs['start_tls'] is True
+
+    def test_session_created_lazily(self, service):
+        """Test that the aiohttp session is only created inside a running loop and closed by aclose."""
+        assert service._aio_session is None
+
+        async def run():
+            session = service._get_aio_session()
+            assert service._get_aio_session() is session
+            await service.aclose()
+            return session
+
+        assert asyncio.run(run()).closed
+        assert service._aio_session is None
+
+
+class TestEmailConnectionReuse:
+    """Test suite for SMTP connection reuse."""
+
+    @pytest.fixture
+    def fake_smtp(self, monkeypatch):
+        connections = []
+
+        class FakeSMTP:
+            def __init__(self, host, port):
+                self.logins = 0
+                self.sent = 0
+                self.healthy = True
+                connections.append(self)
+
+            def starttls(self):
+                pass
+
+            def login(self, username, password):
+                self.logins += 1
+
+            def noop(self):
+                return (250, b'OK') if self.healthy else (421, b'closing')
+
+            def send_message(self, msg):
+                self.sent += 1
+
+            def quit(self):
+                pass
+
+        monkeypatch.setattr(notification_service.smtplib, 'SMTP', FakeSMTP)
+        return connections
+
+    def test_connection_reused_across_emails(self, service, fake_smtp):
+        """Test that consecutive emails share one logged-in SMTP connection."""
+        assert service._send_email_notification("subject", "body")
+        assert service._send_email_notification("subject", "body")
+
+        assert len(fake_smtp) == 1
+        assert fake_smtp[0].logins == 1 and fake_smtp[0].sent == 2
+
+    def test_unhealthy_connection_replaced(self, service, fake_smtp):
+        """Test that a connection failing the NOOP health check is replaced."""
+        service._send_email_notification("subject", "body")
+        fake_smtp[0].healthy = False
+        service._send_email_notification("subject", "body")
+
+        assert len(fake_smtp) == 2 and fake_smtp[1].sent == 1
+
+    def test_connection_rotated(self, service, fake_smtp, monkeypatch):
+        """Test that the connection is rotated after the per-connection message limit."""
+        monkeypatch.setattr(notification_service, 'SMTP_MAX_MESSAGES_PER_CONNECTION', 2)
+
+        for _ in range(3):
+            service._send_email_notification("subject", "body")
+
+        assert [conn.sent for conn in fake_smtp] == [2, 1]
@@ -0,0 +1,293 @@
+"""Unit tests for retrain_model.py"""
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import retrain_model
+from retrain_model import (
+    DataQualityError,
+    build_feature_matrix,
+    engineer_features,
+    evaluate_model,
+    fetch_training_data,
+    get_production_model_metrics,
+    train_model,
+    validate_data_quality,
+)
+
+
+@pytest.fixture
+def raw_transactions():
+    """Small transaction history for two accounts, as returned by fetch_training_data."""
+    return pd.DataFrame({
+        'transaction_id': ['T1', 'T2', 'T3', 'T4'],
+        'account_id': pd.Categorical(['ACC_A', 'ACC_B', 'ACC_A', 'ACC_A']),
+        'amount': [100.0, 50.0, 200.0, 300.0],
+        'timestamp': pd.to_datetime([
+            '2024-01-13 23:30:00',  # Saturday night
+            '2024-01-15 10:00:00',  # Monday
+            '2024-01-15 06:00:00',
+            '2024-01-16 12:15:00',
+        ]),
+        'is_fraud': [0, 0, 0, 1],
+        'account_avg_amount': [200.0, 50.0, 200.0, 200.0],
+        'account_tx_count': [3, 1, 3, 3],
+        'account_max_amount': [300.0, 50.0, 300.0, 300.0],
+    })
+
+
+class TestValidateDataQuality:
+    """Test suite for pre-training data quality checks."""
+
+    def test_valid_data_passes(self, raw_transactions):
+        validate_data_quality(raw_transactions, min_samples=4)
+
+    def test_excessive_nulls_rejected(self, raw_transactions):
+        """Test that columns with more than 10% nulls are named in the error."""
+        raw_transactions.loc[0, 'amount'] = np.nan
+
+        with pytest.raises(DataQualityError, match=r"\['amount'\]"):
+            validate_data_quality(raw_transactions, min_samples=4)
+
+    def test_non_positive_amount_rejected(self, raw_transactions):
+        raw_transactions.loc[1, 'amount'] = 0.0
+
+        with pytest.raises(DataQualityError, match="amount <= 0"):
+            validate_data_quality(raw_transactions, min_samples=4)
+
+
+class TestFetchTrainingData:
+    """Test suite for the training data query."""
+
+    @pytest.fixture
+    def copied(self, monkeypatch):
+        calls = {}
+        cursor = MagicMock()
+        cursor.mogrify.side_effect = lambda query, params: (
+            calls.update(query=query, params=params) or query.encode()
+        )
+
+        def copy_expert(sql, buffer):
+            calls['copy'] = sql
+            buffer.write(
+                b"transaction_id,account_id,amount,timestamp,is_fraud,ml_anomaly_score\n"
+                b"T1,ACC_A,1.5,2024-01-15 10:30:00,0,\n"
+                b"T2,ACC_B,2.5,2024-01-16 11:00:00,1,0.75\n"
+            )
+        cursor.copy_expert.side_effect = copy_expert
+
+        engine = MagicMock()
+        engine.raw_connection.return_value.cursor.return_value.__enter__.return_value = cursor
+        monkeypatch.setattr(retrain_model, '_ENGINE', engine)
+        calls['raw_conn'] = engine.raw_connection.return_value
+        calls['engine'] = engine
+        return calls
+
+    def test_aggregates_computed_in_sql(self, copied):
+        """Test that account aggregates are window functions in the query."""
+        fetch_training_data(lookback_days=30)
+
+        assert "AVG(amount) OVER account AS account_avg_amount" in copied['query']
+        assert "COUNT(*) OVER account AS account_tx_count" in copied['query']
+        assert "MAX(amount) OVER account AS account_max_amount" in copied['query']
+        assert "PARTITION BY account_id" in copied['query']
+        assert "ORDER BY" not in copied['query']  # train_test_split shuffles; no server-side sort
+
+    def test_rows_copied_as_csv(self, copied):
+        """Test that the query runs through COPY and the CSV is parsed into typed columns."""
+        df = fetch_training_data()
+
+        assert copied['copy'].startswith("COPY (")
+        assert copied['copy'].endswith("TO STDOUT WITH (FORMAT CSV, HEADER true)")
+        assert 'cutoff_date' in copied['params']
+        copied['raw_conn'].close.assert_called_once()  # Returned to the shared pool
+        copied['engine'].dispose.assert_not_called()
+
+        assert df['amount'].tolist() == [1.5, 2.5]
+        assert isinstance(df['account_id'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(df['timestamp'])
+        assert pd.isna(df['ml_anomaly_score'].iloc[0])
+
+
+class TestEngineerFeatures:
+    """Test suite for training feature engineering."""
+
+    def test_row_order_preserved(self, raw_transactions):
+        """Test that rows stay aligned with the input order and labels."""
+        df = engineer_features(raw_transactions)
+
+        assert df['transaction_id'].tolist() == ['T1', 'T2', 'T3', 'T4']
+        assert df['is_fraud'].tolist() == [0, 0, 0, 1]
+
+    def test_deviation_features(self, raw_transactions):
+        """Test deviation and max-ratio features."""
+        df = engineer_features(raw_transactions)
+
+        assert df['deviation_from_avg'].iloc[0] == pytest.approx(-0.5)
+        assert df['amount_to_max_ratio'].iloc[3] == pytest.approx(1.0)
+
+    def test_numba_kernel_matches_numpy(self):
+        """Test that the fused kernel and the NumPy fallback agree."""
+        rng = np.random.default_rng(0)
+        amount, avg, max_amount = (rng.uniform(1, 1000, 500) for _ in range(3))
+        fused = (np.empty(500), np.empty(500))
+        plain = (np.empty(500), np.empty(500))
+
+        retrain_model._deviation_ratio(amount, avg, max_amount, *fused)
+        retrain_model._deviation_ratio_numpy(amount, avg, max_amount, *plain)
+
+        np.testing.assert_allclose(fused[0], plain[0], rtol=1e-12)
+        np.testing.assert_allclose(fused[1], plain[1], rtol=1e-12)
+
+    def test_time_features(self, raw_transactions):
+        """Test hour, weekday, weekend and night flags."""
+        df = engineer_features(raw_transactions)
+
+        assert df['hour'].tolist() == [23, 10, 6, 12]
+        assert df['day_of_week'].tolist() == [5, 0, 0, 1]
+        assert df['is_weekend'].tolist() == [1, 0, 0, 0]
+        assert df['is_night'].tolist() == [1, 0, 1, 0]
+
+
+class TestEngineerFeaturesPolars:
+    """Test suite for the polars feature engineering path."""
+
+    def test_matches_pandas_path(self, raw_transactions, monkeypatch):
+        """Test that USE_POLARS produces the same feature values as the default path."""
+        pytest.importorskip("polars")
+        expected = engineer_features(raw_transactions.copy())
+
+        monkeypatch.setattr(retrain_model, 'USE_POLARS', True)
+        actual = engineer_features(raw_transactions.copy())
+
+        columns = ['deviation_from_avg', 'amount_to_max_ratio', 'hour', 'day_of_week', 'is_weekend', 'is_night']
+        pd.testing.assert_frame_equal(actual[columns], expected[columns])
+
+
+class TestBuildFeatureMatrix:
+    """Test suite for the disk-backed feature matrix."""
+
+    def test_float32_matrix_with_nulls_filled(self):
+        """Test that features are copied in column order as contiguous float32 with NaN -> 0."""
+        df = pd.DataFrame({'a': [1.0, np.nan, 3.0], 'b': [4, 5, 6], 'unused': ['x', 'y', 'z']})
+
+        X = build_feature_matrix(df, ['b', 'a'])
+
+        assert X.dtype == np.float32 and X.flags['C_CONTIGUOUS']
+        np.testing.assert_array_equal(X, [[4, 1], [5, 0], [6, 3]])
+
+
+class TestTrainModel:
+    """Test suite for Isolation Forest training."""
+
+    def test_max_samples_capped_for_small_sets(self):
+        """Test that per-tree sample size never exceeds the training set."""
+        X = np.random.default_rng(0).normal(size=(100, 3))
+
+        model = train_model(X)
+
+        assert model.max_samples == 100
+        assert model.n_estimators == 100
+
+    def test_default_max_samples(self):
+        """Test that large training sets use 256 samples per tree."""
+        X = np.random.default_rng(0).normal(size=(1000, 3))
+
+        assert train_model(X).max_samples == 256
+
+    def test_early_stop_once_auc_saturates(self):
+        """Test that trees stop being added when validation AUC stops improving."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(1000, 3)).astype(np.float32)
+        X_val = np.vstack([rng.normal(size=(190, 3)), rng.normal(loc=8, size=(10, 3))]).astype(np.float32)
+        y_val = np.array([0] * 190 + [1] * 10)
+
+        model = train_model(X, X_val, y_val)
+
+        # Outliers are perfectly separated after the first probe, so the second adds no gain
+        assert model.n_estimators == 40
+        assert len(model.estimators_) == 40
+
+    def test_single_class_validation_fits_all_trees(self):
+        """Test that the probe is skipped when validation AUC is undefined."""
+        X = np.random.default_rng(0).normal(size=(300, 3)).astype(np.float32)
+
+        model = train_model(X, X[:50], np.zeros(50, dtype=int))
+
+        assert len(model.estimators_) == 100
+
+
+class TestEvaluateModel:
+    """Test suite for model evaluation."""
+
+    def test_single_scoring_pass_matches_predict(self):
+        """Test that scores and predictions match decision_function/predict."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(500, 3)).astype(np.float32)
+        y = pd.Series((rng.random(500) < 0.05).astype(int))
+        model = train_model(X)
+
+        metrics = evaluate_model(model, X, y)
+
+        expected_scores = model.decision_function(X)
+        expected_predictions = (model.predict(X) == -1).astype(int)
+        assert metrics['fraud_detection_rate'] == pytest.approx(expected_predictions.mean())
+        assert metrics['min_anomaly_score'] == pytest.approx(expected_scores.min())
+        assert metrics['mean_anomaly_score'] == pytest.approx(expected_scores.mean())
+
+    def test_classification_metrics(self):
+        """Test that precision/recall/F1 and score stats match the individual sklearn/numpy calls."""
+        from sklearn.metrics import f1_score, precision_score, recall_score
+
+        rng = np.random.default_rng(1)
+        X = np.vstack([rng.normal(size=(480, 3)), rng.normal(loc=6, size=(20, 3))]).astype(np.float32)
+        y = pd.Series([0] * 480 + [1] * 20)
+        model = train_model(X)
+
+        metrics = evaluate_model(model, X, y)
+
+        predictions = (model.predict(X) == -1).astype(int)
+        assert metrics['precision'] == pytest.approx(precision_score(y, predictions, zero_division=0))
+        assert metrics['recall'] == pytest.approx(recall_score(y, predictions, zero_division=0))
+        assert metrics['f1_score'] == pytest.approx(f1_score(y, predictions, zero_division=0))
+        assert metrics['std_anomaly_score'] == pytest.approx(model.decision_function(X).std(), rel=1e-5)
+
+
+class TestProductionModelMetrics:
+    """Test suite for the cached production metrics lookup."""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(retrain_model, 'PROD_METRICS_CACHE_FILE', str(tmp_path / 'metrics.json'))
+        monkeypatch.setattr(retrain_model, '_prod_metrics_cache', {})
+        client = MagicMock()
+        client.get_latest_versions.return_value = [MagicMock(version='3', run_id='run-3')]
+        client.get_run.return_value.data.metrics = {'f1_score': 0.5}
+        return client
+
+    def test_run_fetched_once_per_version(self, client):
+        """Test that get_run is skipped while the production version is unchanged."""
+        assert get_production_model_metrics(client) == {'f1_score': 0.5}
+        assert get_production_model_metrics(client) == {'f1_score': 0.5}
+
+        assert client.get_latest_versions.call_count == 2
+        client.get_run.assert_called_once_with('run-3')
+
+    def test_file_cache_survives_restart(self, client, monkeypatch):
+        """Test that a fresh process reads the metrics from the cache file."""
+        get_production_model_metrics(client)
+        monkeypatch.setattr(retrain_model, '_prod_metrics_cache', {})
+
+        assert get_production_model_metrics(client) == {'f1_score': 0.5}
+        client.get_run.assert_called_once()
+
+    def test_new_version_invalidates_cache(self, client):
+        """Test that promoting a new version fetches its metrics."""
+        get_production_model_metrics(client)
+        client.get_latest_versions.return_value = [MagicMock(version='4', run_id='run-4')]
+        client.get_run.return_value.data.metrics = {'f1_score': 0.7}
+
+        assert get_production_model_metrics(client) == {'f1_score': 0.7}
+        assert client.get_run.call_count == 2
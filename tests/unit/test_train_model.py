@@ -0,0 +1,149 @@
+"""Unit tests for train_model.py"""
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import IsolationForest
+
+import train_model
+from train_model import decision_score_bounds, load_training_data
+
+
+def _copy_engine(payload):
+    """Engine whose raw connection COPYs the given CSV payload."""
+    engine = MagicMock()
+    cursor = engine.raw_connection.return_value.cursor.return_value.__enter__.return_value
+    cursor.copy_expert.side_effect = lambda sql, buffer: buffer.write(payload)
+    return engine, cursor
+
+
+class TestLoadTrainingData:
+    """Test suite for the COPY-based training data loader."""
+
+    def test_aggregates_computed_in_sql(self):
+        """Test that only the feature columns are streamed, with account aggregates from a window."""
+        engine, cursor = _copy_engine(
+            b"amount,account_avg_amount,account_tx_count\n1.5,1.75,2\n2,1.75,2\n"
+        )
+
+        df = load_training_data(engine)
+
+        sql = cursor.copy_expert.call_args.args[0]
+        assert sql.startswith("COPY (") and "TO STDOUT" in sql
+        assert "SELECT *" not in sql
+        assert "OVER account" in sql and "PARTITION BY account_id" in sql
+        assert df['amount'].tolist() == [1.5, 2.0]
+        assert df['account_tx_count'].dtype == 'int64'
+        engine.raw_connection.return_value.close.assert_called_once()
+
+
+@pytest.fixture
+def training_run(monkeypatch):
+    """Runs train_and_register_model on synthetic data with MLflow and the database mocked out."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'amount': rng.gamma(2.0, 100.0, size=400),
+        'account_avg_amount': np.repeat(rng.gamma(2.0, 100.0, size=20), 20),
+        'account_tx_count': np.full(400, 20),
+    })
+    mlflow_mock = MagicMock()
+    fitted = []
+    real_fit = IsolationForest.fit
+
+    def spy_fit(self, X, *args, **kwargs):
+        fitted.append(X)
+        return real_fit(self, X, *args, **kwargs)
+
+    monkeypatch.setattr(train_model, 'mlflow', mlflow_mock)
+    monkeypatch.setattr(train_model, '_engine', MagicMock())
+    monkeypatch.setattr(train_model, '_client', None)
+    monkeypatch.setattr(train_model, 'load_training_data', lambda engine: df.copy())
+    monkeypatch.setattr(IsolationForest, 'fit', spy_fit)
+
+    train_model.train_and_register_model()
+
+    model = mlflow_mock.sklearn.log_model.call_args.kwargs['sk_model']
+    return model, fitted[0], mlflow_mock
+
+
+class TestTrainAndRegisterModel:
+    """Test suite for the initial training run."""
+
+    def test_fit_on_float32_features(self, training_run):
+        """Test that the forest is fit on float32 features, matching the detection service."""
+        model, X, _ = training_run
+
+        assert (X.dtypes == np.float32).all()
+        assert list(model.feature_names_in_) == ['amount', 'account_avg_amount', 'deviation_from_avg']
+        assert model.max_samples == 256
+
+    def test_registered_version_promoted(self, training_run):
+        """Test that only the newest unstaged version is fetched and moved to Production."""
+        _, _, mlflow_mock = training_run
+        client = mlflow_mock.tracking.MlflowClient.return_value
+        client.get_latest_versions.return_value = [MagicMock(version='7')]
+
+        train_model.train_and_register_model()
+
+        client.get_latest_versions.assert_called_with("fraud-detection-model", stages=["None"])
+        client.search_model_versions.assert_not_called()
+        assert client.transition_model_version_stage.call_args.kwargs['version'] == '7'
+        mlflow_mock.tracking.MlflowClient.assert_called_once()
+
+    def test_conda_env_skipped_by_default(self, training_run):
+        """Test that dev runs pass explicit pip requirements instead of packaging a conda env."""
+        _, _, mlflow_mock = training_run
+
+        kwargs = mlflow_mock.sklearn.log_model.call_args.kwargs
+        assert 'conda_env' not in kwargs
+        assert kwargs['pip_requirements'] is mlflow_mock.sklearn.get_default_pip_requirements.return_value
+
+    def test_conda_env_opt_in(self, training_run, monkeypatch):
+        """Test that MLFLOW_LOG_CONDA packages the conda env."""
+        _, _, mlflow_mock = training_run
+        monkeypatch.setattr(train_model, 'LOG_CONDA_ENV', True)
+
+        train_model.train_and_register_model()
+
+        kwargs = mlflow_mock.sklearn.log_model.call_args.kwargs
+        assert kwargs['conda_env']['name'] == "mlflow-env"
+        assert 'pip_requirements' not in kwargs
+
+    def test_fit_parallel_and_reproducible(self, training_run):
+        """Test that trees are built on all cores with a fixed seed."""
+        model, _, _ = training_run
+
+        assert model.n_jobs == -1
+        assert model.random_state == 42
+
+
+class TestGetEngine:
+    """Test suite for the shared training engine."""
+
+    def test_engine_created_once(self, monkeypatch):
+        """Test that repeated training runs reuse one single-connection engine."""
+        factory = MagicMock()
+        monkeypatch.setattr(train_model, '_engine', None)
+        monkeypatch.setattr(train_model, 'create_engine', factory)
+        monkeypatch.setattr(train_model.atexit, 'register', MagicMock())
+
+        assert train_model._get_engine() is train_model._get_engine()
+        factory.assert_called_once()
+        assert factory.call_args.kwargs['pool_size'] == 1
+
+
+@pytest.mark.xdist_group("model_session")
+class TestDecisionScoreBounds:
+    """Test suite for the batched score-boundary computation."""
+
+    def test_matches_full_decision_function(self, mock_model):
+        """Test that batched bounds equal the min/max of a single decision_function call."""
+        features = pd.DataFrame(
+            np.random.default_rng(0).normal(200, 80, size=(1000, 3)),
+            columns=['amount', 'account_avg_amount', 'deviation_from_avg']
+        )
+        scores = mock_model.decision_function(features)
+
+        assert decision_score_bounds(mock_model, features, batch_size=64) == \
+            pytest.approx((scores.min(), scores.max()))
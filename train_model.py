@@ -1,4 +1,7 @@
+import io
 import os
+import atexit
+import numpy as np
 import pandas as pd
 from sqlalchemy import create_engine
 from sklearn.ensemble import IsolationForest
@@ -15,6 +18,103 @@ HIGH_VALUE_THRESHOLD = 5000.00
 SUSPICIOUS_MERCHANT = 'Gambling'
 STANDARD_LOCATION = 'Helsinki'
 
+LOG_CONDA_ENV = os.environ.get("MLFLOW_LOG_CONDA", "false").lower() in ("1", "true", "yes")  # Package the conda env with the model
+SCORE_BATCH_SIZE = int(os.environ.get("SCORE_BATCH_SIZE", 65536))  # Rows per decision_function call for score bounds
+
+# Only the columns feature engineering reads; the per-account aggregates come from Postgres
+# window functions, so pandas needs no grouping pass and account_id never leaves the server
+TRAINING_QUERY = f"""
+    SELECT
+        amount,
+        AVG(amount) OVER account AS account_avg_amount,
+        COUNT(*) OVER account AS account_tx_count
+    FROM {TABLE_NAME}
+    WINDOW account AS (PARTITION BY account_id)
+"""
+
+
+def load_training_data(engine):
+    """
+    Loads the training columns with COPY ... TO STDOUT: Postgres streams one CSV payload and
+    pandas' C parser builds the columns, instead of psycopg2 creating a Python tuple per row.
+    """
+    buffer = io.BytesIO()
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cursor:
+            cursor.copy_expert(f"COPY ({TRAINING_QUERY}) TO STDOUT WITH (FORMAT CSV, HEADER true)", buffer)
+    finally:
+        raw_conn.close()
+
+    buffer.seek(0)
+    return pd.read_csv(
+        buffer,
+        dtype={'amount': 'float64', 'account_avg_amount': 'float64', 'account_tx_count': 'int64'}
+    )
+
+# Lazily created engine shared by every training run in this process (sequential: one connection)
+_engine = None
+
+
+# Registry client reused alongside the engine (created after the tracking URI is set)
+_client = None
+
+
+def _get_engine():
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL, pool_size=1, pool_pre_ping=True)
+        atexit.register(_engine.dispose)
+    return _engine
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = mlflow.tracking.MlflowClient()
+    return _client
+
+def _build_conda_env():
+    return {
+        "channels": ["conda-forge"],
+        "dependencies": [
+            "python=3.9.18", # Match your Python version
+            "pip",
+            {
+                "pip": [
+                    "scikit-learn==1.0.2", # Pin to specific version if known
+                    "pandas==1.5.3",
+                    "numpy==1.23.5",
+                    # Add any other specific versions used
+                ]
+            },
+        ],
+        "name": "mlflow-env",
+    }
+
+
+def _model_environment():
+    """
+    Environment arguments for log_model. The conda env is only packaged when MLFLOW_LOG_CONDA is
+    set (deployments); otherwise the flavor's default pip requirements are passed explicitly,
+    which also skips MLflow's requirement inference.
+    """
+    if LOG_CONDA_ENV:
+        return {"conda_env": _build_conda_env()}
+    return {"pip_requirements": mlflow.sklearn.get_default_pip_requirements()}
+
+def decision_score_bounds(model, features, batch_size=SCORE_BATCH_SIZE):
+    """
+    Returns the (min, max) decision score over the training features, scoring one row batch at
+    a time so only a batch of scores is held instead of a full-length score vector.
+    """
+    min_score, max_score = np.inf, -np.inf
+    for start in range(0, len(features), batch_size):
+        scores = model.decision_function(features.iloc[start:start + batch_size])
+        min_score = min(min_score, scores.min())
+        max_score = max(max_score, scores.max())
+    return float(min_score), float(max_score)
+
 def train_and_register_model():
     """
     Trains the Isolation Forest model on the full dataset, logs it to MLflow,
@@ -23,82 +123,71 @@ def train_and_register_model():
     mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
     mlflow.set_experiment("Fraud Detection Model Training")
 
-    engine = create_engine(DATABASE_URL)
+    print("Loading data for model training...")
+    df = load_training_data(_get_engine())
+    
+    if df.empty:
+        raise ValueError("No data available for training. Please run setup_db.py.")
 
-    with engine.connect() as conn:
-        print("Loading data for model training...")
-        df = pd.read_sql_query(f"SELECT * FROM {TABLE_NAME}", conn)
-        
-        if df.empty:
-            raise ValueError("No data available for training. Please run setup_db.py.")
+    # --- Feature Engineering (consistent with detection_logic.py) ---
+    df['deviation_from_avg'] = (df['amount'] - df['account_avg_amount']) / (df['account_avg_amount'] + 1e-6)
+    
+    # float32 like the detection service's feature rows (detection_logic.score_transaction):
+    # the trees split on float32 internally, so this halves the matrix fit works over
+    features_for_model = df[['amount', 'account_avg_amount', 'deviation_from_avg']].astype(np.float32)
+    del df  # release the float64 source columns before the long fit
+
+    # --- Model Training ---
+    n_estimators = 100
+    max_samples = min(256, len(features_for_model))  # sklearn's default subsample per tree, capped
+    contamination = 'auto'
+    random_state = 42
+
+    # CPU scikit-learn only: RAPIDS cuML has no IsolationForest estimator, and the detection
+    # service loads this model with mlflow.sklearn and calls decision_function on it directly
+    with mlflow.start_run():
+        print("Training Isolation Forest model...")
+        model = IsolationForest(
+            n_estimators=n_estimators,
+            max_samples=max_samples,
+            contamination=contamination,
+            random_state=random_state,  # Fixed seed keeps parallel fits reproducible
+            n_jobs=-1  # Build trees (and score) on all available cores
+        )
+        model.fit(features_for_model)
 
-        # --- Feature Engineering (consistent with detection_logic.py) ---
-        df['account_avg_amount'] = df.groupby('account_id')['amount'].transform('mean')
-        df['account_tx_count'] = df.groupby('account_id')['amount'].transform('count')
-        df['deviation_from_avg'] = (df['amount'] - df['account_avg_amount']) / (df['account_avg_amount'] + 1e-6)
+        # --- Log parameters and metrics ---
+        mlflow.log_param("n_estimators", n_estimators)
+        mlflow.log_param("max_samples", max_samples)
+        mlflow.log_param("contamination", contamination)
+        mlflow.log_param("random_state", random_state)
+
+        # Calculate and log score boundaries
+        min_score, max_score = decision_score_bounds(model, features_for_model)
+        mlflow.log_metric("min_decision_score", min_score)
+        mlflow.log_metric("max_decision_score", max_score)
         
-        features_for_model = df[['amount', 'account_avg_amount', 'deviation_from_avg']].copy()
-
-        # --- Model Training ---
-        n_estimators = 100
-        contamination = 'auto'
-        random_state = 42
-
-        with mlflow.start_run():
-            print("Training Isolation Forest model...")
-            model = IsolationForest(
-                n_estimators=n_estimators,
-                contamination=contamination,
-                random_state=random_state
-            )
-            model.fit(features_for_model)
-
-            # --- Log parameters and metrics ---
-            mlflow.log_param("n_estimators", n_estimators)
-            mlflow.log_param("contamination", contamination)
-            mlflow.log_param("random_state", random_state)
-
-            # Calculate and log score boundaries
-            anomaly_scores = model.decision_function(features_for_model)
-            min_score, max_score = anomaly_scores.min(), anomaly_scores.max()
-            mlflow.log_metric("min_decision_score", min_score)
-            mlflow.log_metric("max_decision_score", max_score)
-            
-            # Save the model and register it
-            model_name = "fraud-detection-model"
-            mlflow.sklearn.log_model(
-                sk_model=model,
-                artifact_path="isolation_forest_model",
-                registered_model_name=model_name,
-                conda_env={
-                    "channels": ["conda-forge"],
-                    "dependencies": [
-                        "python=3.9.18", # Match your Python version
-                        "pip",
-                        {
-                            "pip": [
-                                "scikit-learn==1.0.2", # Pin to specific version if known
-                                "pandas==1.5.3",
-                                "numpy==1.23.5",
-                                # Add any other specific versions used
-                            ]
-                        },
-                    ],
-                    "name": "mlflow-env",
-                }
-            )
-
-            # Transition to Production stage
-            client = mlflow.tracking.MlflowClient()
-            model_version = client.search_model_versions(f"name='{model_name}'")[0].version
-            client.transition_model_version_stage(
-                name=model_name,
-                version=model_version,
-                stage="Production"
-            )
-            print(f"Model '{model_name}' version {model_version} registered and set to 'Production' stage.")
-
-    engine.dispose()
+        # Save the model and register it
+        model_name = "fraud-detection-model"
+        mlflow.sklearn.log_model(
+            sk_model=model,
+            artifact_path="isolation_forest_model",
+            registered_model_name=model_name,
+            **_model_environment()
+        )
+
+        # Transition to Production stage
+        # The version just registered is the newest one without a stage; asking for it
+        # directly avoids listing every version of the model
+        client = _get_client()
+        model_version = client.get_latest_versions(model_name, stages=["None"])[0].version
+        client.transition_model_version_stage(
+            name=model_name,
+            version=model_version,
+            stage="Production"
+        )
+        print(f"Model '{model_name}' version {model_version} registered and set to 'Production' stage.")
+
     print("Model training and registration complete.")
 
 if __name__ == "__main__":